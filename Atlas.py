@@ -0,0 +1,99 @@
+import pygame
+
+
+# Packs sprites into a few large pages so they can all be drawn with batched blits.
+# Sprites are added on first use through loader(key), which returns the surface to pack. Pages are filled
+# shelf by shelf, a sprite bigger than a page gets a page of its own.
+class Atlas:
+
+    def __init__(self, loader, page_size=(1024, 1024), padding=1):
+        self.loader = loader
+        self.pageSize = page_size
+        self.padding = padding
+        self.pages = []
+        self.sprites = {}
+
+        # Shelves of the page being filled as [y, height, next free x]
+        self.openPage = None
+        self.shelves = []
+        self.shelvesBottom = 0
+
+    def __contains__(self, key):
+        return key in self.sprites
+
+    def __len__(self):
+        return len(self.sprites)
+
+    # The page holding key and the sprite's area on it
+    def get(self, key):
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = self.add(key, self.loader(key))
+        return sprite
+
+    def add(self, key, surface):
+        width, height = surface.get_size()
+        paddedWidth = width + self.padding
+        paddedHeight = height + self.padding
+
+        if paddedWidth > self.pageSize[0] or paddedHeight > self.pageSize[1]:
+            # Too big to share, the page being filled stays open for the next sprites
+            page = self.newPage((width, height))
+            position = (0, 0)
+        else:
+            position = self.place(paddedWidth, paddedHeight)
+            page = self.openPage
+
+        # BLEND_RGBA_MAX onto a cleared page copies the pixels as they are, a normal blit would blend the alpha in
+        page.blit(surface, position, special_flags=pygame.BLEND_RGBA_MAX)
+
+        sprite = (page, pygame.Rect(position[0], position[1], width, height))
+        self.sprites[key] = sprite
+        return sprite
+
+    def place(self, width, height):
+        if self.openPage is None:
+            self.openShelfPage()
+
+        for shelf in self.shelves:
+            if height <= shelf[1] and shelf[2] + width <= self.pageSize[0]:
+                position = (shelf[2], shelf[0])
+                shelf[2] += width
+                return position
+
+        if self.shelvesBottom + height > self.pageSize[1]:
+            self.openShelfPage()
+
+        shelf = [self.shelvesBottom, height, width]
+        self.shelves.append(shelf)
+        self.shelvesBottom += height
+        return 0, shelf[0]
+
+    def openShelfPage(self):
+        self.openPage = self.newPage(self.pageSize)
+        self.shelves = []
+        self.shelvesBottom = 0
+
+    def newPage(self, size):
+        page = pygame.Surface(size, pygame.SRCALPHA)
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        return page
+
+
+# Queues sprite draws from an atlas and sends them to the target in one Surface.blits call.
+# Draws keep their order so anything drawn without the batch has to flush it first.
+class SpriteBatch:
+
+    def __init__(self, atlas):
+        self.atlas = atlas
+        self.queue = []
+
+    def add(self, key, position):
+        page, area = self.atlas.get(key)
+        self.queue.append((page, position, area))
+
+    def flush(self, target):
+        if len(self.queue) > 0:
+            target.blits(self.queue, False)
+            self.queue = []
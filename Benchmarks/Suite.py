@@ -0,0 +1,277 @@
+# Benchmarks for the hot paths of Game.py: movement ranges, map rendering, the item list, dice, OIDs and
+# world generation. Runs headless against an offscreen surface and prints JSON, one record per benchmark and
+# parameter set, with timings in milliseconds and the traced memory peak in kilobytes.
+#
+#   python Benchmarks/Suite.py --quick --output results.json
+#   python Benchmarks/Suite.py --baseline results.json
+#
+# With --baseline the run exits with status 1 when a benchmark got slower than threshold times its old median.
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+
+import Dice
+import Game
+import Simulator
+from Pathfinding import findReachable, findReachableMany
+from Registry import Registry
+from Visibility import fieldOfView
+
+
+# Every setup takes its parameters and returns the function to time
+
+def setupReachable(size, movement):
+    Game.generateTiles(size, size)
+    return lambda: findReachable(Game.tiles.difficulty, size // 2, size // 2, movement, Game.BASE_MOVEMENT_COST)
+
+
+# Movement ranges of many characters, one findReachable each or all of them in a single batch
+def setupReachableMany(size, movement, characters, batched):
+    Game.generateTiles(size, size)
+    starts = [((count * 7919) % size, (count * 104729) % size, movement) for count in range(characters)]
+    minDifficulty = float(Game.tiles.terrainCosts.min())
+
+    if batched:
+        return lambda: findReachableMany(Game.tiles.difficulty, starts, Game.BASE_MOVEMENT_COST, minDifficulty)
+    return lambda: [findReachable(Game.tiles.difficulty, x, y, moves, Game.BASE_MOVEMENT_COST)
+                    for x, y, moves in starts]
+
+
+def setupCachedReachable(size, movement):
+    Game.generateTiles(size, size)
+    character = Game.Character((size // 2, size // 2), movement)
+    return lambda: character.findTilesToMoveTo(character.x, character.y)
+
+
+def setupDrawMap(size, chunks):
+    Game.generateTiles(size, size)
+    for count in range(size):
+        Game.tiles[count][count].addContent(Game.Tree())
+
+    def drawTiles():
+        for row, col, x_cords, y_cords in Game.visibleTiles(Game.camera, size, size, Game.SCREEN_WIDTH,
+                                                            Game.SCREEN_HEIGHT, Game.TILE_SIZE):
+            Game.tiles.tile(row, col).draw(x_cords, y_cords)
+
+    def drawChunks():
+        Game.camera[1] = (Game.camera[1] + 1) % size
+        Game.drawMap()
+
+    return drawChunks if chunks else drawTiles
+
+
+# Items with their own names so each one is a row of its own rather than one stack
+def setupListDisplay(items):
+    Game.generateTiles()
+    character = Game.Character((0, 0))
+    for count in range(items):
+        character.get(Game.Item("Sunglasses", count % 7, count % 11, name="Item%d" % count))
+    Game.selected = character
+    display = Game.ListDisplay(character.items, txt="Items")
+    return display.draw
+
+
+def setupRoll(dice):
+    text = "%s-1d4" % dice
+    return lambda: Game.roll(text)
+
+
+def setupRollMany(dice, rolls):
+    roller = Dice.compileDice(dice)
+    return lambda: roller.rollMany(rolls)
+
+
+def setupOIDs(objects):
+    def allocate():
+        registry = Registry()
+        for count in range(objects):
+            registry.add(count)
+    return allocate
+
+
+def setupGenerate(size):
+    return lambda: Game.generateTiles(size, size)
+
+
+# Scrolls the camera across a generated world, step tiles per call, loading and dropping chunks on the way
+def setupStream(step):
+    Game.generateWorld(0)
+
+    def scroll():
+        Game.camera[1] += step
+        Game.tiles.stream(Game.camera[0], Game.camera[1])
+
+    return scroll
+
+
+# Field of view among scattered trees, computed every call or through the cache
+def setupFieldOfView(radius, cached):
+    Game.generateTiles(256, 256)
+    for count in range(2000):
+        Game.tiles.addContent((count * 7919) % 256, (count * 104729) % 256, Game.Tree())
+    character = Game.Character((128, 128))
+
+    if cached:
+        return lambda: character.findVisibleTiles(radius)
+    return lambda: fieldOfView(Game.isBlocked, character.x, character.y, radius, 256, 256)
+
+
+# Which characters see which others, every pair in range checked in one lineOfSight call
+def setupSight(characters):
+    Game.generateTiles(256, 256)
+    for count in range(2000):
+        Game.tiles.addContent((count * 7919) % 256, (count * 104729) % 256, Game.Tree())
+    crowd = [Game.Character((100 + (count * 31) % 40, 100 + (count * 17) % 40)) for count in range(characters)]
+    return lambda: Game.charactersInSight(crowd)
+
+
+# Encounters of the default item action and a damage action, in this process or across a process pool
+def setupSimulate(encounters, workers):
+    return lambda: Simulator.simulate(["H-1d10-False", "D-2d6-psychic-False"], encounters, seed=0, workers=workers)
+
+
+# Drops an item and picks it back up, equips and unequips another, then reads the first page sorted by value
+def setupInventory(items, kinds):
+    Game.generateTiles()
+    character = Game.Character((0, 0))
+    Game.tiles.addContent(0, 0, character)
+    for count in range(items):
+        character.get(Game.Item("Sunglasses", count % 7, count % kinds, name="Item%d" % (count % kinds)))
+    dropped, worn = list(character.items)[-2:]
+
+    def churn():
+        character.drop(dropped)
+        character.pickUp(dropped)
+        character.equip(worn)
+        character.unequip(worn)
+        return character.items.sortedBy("value", 0, 15)
+
+    character.items.sortedBy("value")
+    return churn
+
+
+# name -> (setup, parameter grid for a full run, parameter grid for --quick)
+BENCHMARKS = {
+    "reachable": (setupReachable, {"size": [24, 256, 1024], "movement": [35, 105, 305]},
+                  {"size": [24, 256], "movement": [35, 105]}),
+    "reachable_many": (setupReachableMany, {"size": [256, 1024], "movement": [35, 105, 305], "characters": [10, 50],
+                                            "batched": [False, True]},
+                       {"size": [256], "movement": [35, 105], "characters": [50], "batched": [False, True]}),
+    "reachable_cached": (setupCachedReachable, {"size": [24, 1024], "movement": [35, 305]},
+                         {"size": [24], "movement": [35]}),
+    "draw_map": (setupDrawMap, {"size": [24, 256, 1024], "chunks": [False, True]},
+                 {"size": [24, 256], "chunks": [False, True]}),
+    "list_display": (setupListDisplay, {"items": [2, 100, 1000]}, {"items": [2, 100]}),
+    "inventory": (setupInventory, {"items": [100, 10000], "kinds": [10, 10000]},
+                  {"items": [10000], "kinds": [10, 10000]}),
+    "roll": (setupRoll, {"dice": ["1d10", "10d6", "100d6"]}, {"dice": ["1d10", "100d6"]}),
+    "roll_many": (setupRollMany, {"dice": ["1d10", "100d6"], "rolls": [1000, 100000]},
+                  {"dice": ["1d10", "100d6"], "rolls": [1000]}),
+    "oids": (setupOIDs, {"objects": [1000, 100000, 1000000]}, {"objects": [1000, 100000]}),
+    "generate": (setupGenerate, {"size": [24, 256, 1024, 4096]}, {"size": [24, 256, 1024]}),
+    "stream": (setupStream, {"step": [1, 32, 256]}, {"step": [1, 32]}),
+    "field_of_view": (setupFieldOfView, {"radius": [8, 32], "cached": [False, True]},
+                      {"radius": [8], "cached": [False, True]}),
+    "sight": (setupSight, {"characters": [10, 50, 200]}, {"characters": [10, 50]}),
+    "simulate": (setupSimulate, {"encounters": [10000, 1000000], "workers": [1, 4]},
+                 {"encounters": [10000], "workers": [1]}),
+}
+
+
+def measure(name, setup, params, repeat):
+    function = setup(**params)
+
+    # Warm up once so lazy caches and surfaces are not counted against the first sample
+    function()
+
+    times = []
+    for count in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"name": name, "params": params, "repeat": repeat,
+            "min_ms": times[0], "median_ms": times[len(times) // 2], "mean_ms": sum(times) / len(times),
+            "peak_kb": peak / 1024}
+
+
+def key(record):
+    return record["name"] + json.dumps(record["params"], sort_keys=True)
+
+
+def compare(results, baseline_file, threshold):
+    with open(baseline_file) as file:
+        baseline = {key(record): record for record in json.load(file)["results"]}
+
+    regressions = []
+    for record in results:
+        old = baseline.get(key(record))
+        if old is not None:
+            record["baseline_median_ms"] = old["median_ms"]
+            record["ratio"] = record["median_ms"] / old["median_ms"] if old["median_ms"] > 0 else None
+            if record["ratio"] is not None and record["ratio"] > threshold:
+                regressions.append(key(record))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the hot paths of Game.py")
+    parser.add_argument("--quick", action="store_true", help="smaller parameter grid")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per parameter set")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    Game.init(headless=True)
+    Game.screen = pygame.Surface((Game.SCREEN_WIDTH, Game.SCREEN_HEIGHT))
+    Dice.seed(0)
+
+    results = []
+    for name, (setup, full, quick) in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+
+        grid = quick if args.quick else full
+        for values in itertools.product(*grid.values()):
+            params = dict(zip(grid.keys(), values))
+            record = measure(name, setup, params, args.repeat)
+            results.append(record)
+            print("%-18s %-40s %10.3f ms %12.1f KiB" % (name, json.dumps(params), record["median_ms"],
+                                                        record["peak_kb"]), file=sys.stderr)
+
+    report = {"python": sys.version.split()[0], "pygame": pygame.version.ver, "results": results}
+
+    regressions = []
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        report["regressions"] = regressions
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    print(json.dumps(report, indent=2))
+
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
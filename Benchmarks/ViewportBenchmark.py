@@ -0,0 +1,140 @@
+# Frame time of the flat viewport renderer and the chunk cache against the old recursive Tile.draw traversal.
+# Runs headless against an offscreen surface: python Benchmarks/ViewportBenchmark.py [frames]
+import functools
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+
+from Grid import Grid
+from Viewport import ChunkCache, visibleTiles
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 800
+TILE_SIZE = int(SCREEN_WIDTH / 24)
+HALF_TILE = int(TILE_SIZE / 2)
+TILES_X = SCREEN_WIDTH / TILE_SIZE
+TILES_Y = SCREEN_HEIGHT / TILE_SIZE
+OUTLINE_SIZE = int(TILE_SIZE / 25 + 1)
+
+LEFT = 0
+UP = 1
+RIGHT = 2
+DOWN = 3
+
+
+class Terrain:
+
+    def __init__(self, difficulty, color):
+        self.difficulty = difficulty
+        self.color = color
+
+
+class BenchTile:
+
+    def __init__(self, grid, row, col):
+        self.grid = grid
+        self.row = row
+        self.col = col
+
+    @property
+    def connections(self):
+        grid = self.grid
+        return [grid.tile(self.row, self.col + 1), grid.tile(self.row + 1, self.col),
+                grid.tile(self.row, self.col - 1), grid.tile(self.row - 1, self.col)]
+
+    def paint(self, surface, x_cords, y_cords):
+        color = self.grid.getTerrain(self.row, self.col).color
+        pygame.draw.rect(surface, color, (x_cords, y_cords, TILE_SIZE, TILE_SIZE))
+        pygame.draw.rect(surface, (20, 20, 20), (x_cords, y_cords, TILE_SIZE, TILE_SIZE), OUTLINE_SIZE)
+
+    # The traversal Tile.draw used before the viewport renderer, kept here as the reference
+    def drawRecursive(self, surface, x, y, direction_x, direction_y, drawn):
+        x_cords = int(SCREEN_WIDTH / 2 - HALF_TILE - x * TILE_SIZE)
+        y_cords = int(SCREEN_HEIGHT / 2 - HALF_TILE - y * TILE_SIZE)
+        self.paint(surface, x_cords, y_cords)
+        drawn.append((x_cords, y_cords))
+
+        if x == 0 and y == 0:
+            self.connections[LEFT].drawRecursive(surface, x - 1, y, -1, 0, drawn)
+            self.connections[RIGHT].drawRecursive(surface, x + 1, y, 1, 0, drawn)
+            self.connections[UP].drawRecursive(surface, x, y - 1, 0, -1, drawn)
+            self.connections[DOWN].drawRecursive(surface, x, y + 1, 0, 1, drawn)
+        elif y == 0:
+            self.connections[UP].drawRecursive(surface, x, y - 1, 0, -1, drawn)
+            self.connections[DOWN].drawRecursive(surface, x, y + 1, 0, 1, drawn)
+            if direction_x == -1 and math.fabs(x) < TILES_X / 2:
+                self.connections[LEFT].drawRecursive(surface, x - 1, y, -1, 0, drawn)
+            if direction_x == 1 and x < TILES_X / 2:
+                self.connections[RIGHT].drawRecursive(surface, x + 1, y, 1, 0, drawn)
+        else:
+            if direction_y == -1 and math.fabs(y) < TILES_Y / 2:
+                self.connections[UP].drawRecursive(surface, x, y - 1, 0, -1, drawn)
+            if direction_y == 1 and y < TILES_Y / 2:
+                self.connections[DOWN].drawRecursive(surface, x, y + 1, 0, 1, drawn)
+
+
+def recursiveFrame(grid, surface, camera):
+    drawn = []
+    grid.tile(camera[0], camera[1]).drawRecursive(surface, 0, 0, 0, 0, drawn)
+    return drawn
+
+
+def viewportFrame(grid, surface, camera):
+    drawn = []
+    for row, col, x_cords, y_cords in visibleTiles(camera, grid.rows, grid.cols,
+                                                   SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE):
+        grid.tile(row, col).paint(surface, x_cords, y_cords)
+        drawn.append((x_cords, y_cords))
+    return drawn
+
+
+def chunkFrame(chunks, grid, surface, camera):
+    chunks.draw(surface, camera)
+    return [(x, y) for row, col, x, y in visibleTiles(camera, grid.rows, grid.cols,
+                                                      SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE)]
+
+
+def timeFrames(frame, grid, surface, frames):
+    camera = [grid.rows // 2, grid.cols // 2]
+    drawn = frame(grid, surface, camera)
+
+    start = time.perf_counter()
+    for count in range(frames):
+        camera[1] = (camera[1] + 1) % grid.cols
+        frame(grid, surface, camera)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / frames * 1000, drawn
+
+
+def main(frames=200):
+    pygame.init()
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    terrains = [Terrain(1, (100, 255, 150)), Terrain(0.75, (115, 90, 75))]
+
+    print("%-10s %-10s %12s %8s %8s %8s" % ("map", "renderer", "ms/frame", "draws", "unique", "missing"))
+    for rows, cols in ((16, 24), (64, 64), (1000, 1000)):
+        grid = Grid(rows, cols, terrains, BenchTile)
+        grid.fill(terrains[1], rows=slice(rows // 2 - 1, rows // 2 + 2))
+        chunks = ChunkCache(grid, TILE_SIZE, lambda target, row, col, x, y: grid.tile(row, col).paint(target, x, y))
+        screenCells = int(math.ceil(TILES_X + 1) * math.ceil(TILES_Y + 1))
+
+        renderers = (("recursive", recursiveFrame), ("viewport", viewportFrame),
+                     ("chunks", functools.partial(chunkFrame, chunks)))
+        for name, frame in renderers:
+            ms, drawn = timeFrames(frame, grid, surface, frames)
+            onScreen = {d for d in drawn if -TILE_SIZE < d[0] < SCREEN_WIDTH and -TILE_SIZE < d[1] < SCREEN_HEIGHT}
+            print("%-10s %-10s %12.3f %8d %8d %8d" % ("%dx%d" % (rows, cols), name, ms, len(drawn), len(set(drawn)),
+                                                     screenCells - len(onScreen)))
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
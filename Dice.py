@@ -0,0 +1,71 @@
+import functools
+import re
+import numpy as np
+
+
+# Shared random stream, seed it to replay a whole run
+RNG = np.random.default_rng()
+
+TERM = re.compile(r"^(\d*)d(\d+)$|^(\d+)$")
+
+
+def seed(value=None):
+    global RNG
+    RNG = np.random.default_rng(value)
+
+
+# A dice string parsed once, i.e. 2d6-1d4 is two d6 and one d4.
+# Like strToAmount always did, every term separated by "-" is added to the total and a bare number is a flat amount.
+class DiceRoller:
+
+    def __init__(self, text, dice, constant):
+        self.text = text
+        self.dice = dice
+        self.constant = constant
+
+    def __repr__(self):
+        return "DiceRoller(%r)" % self.text
+
+    def roll(self, rng=None):
+        if rng is None:
+            rng = RNG
+
+        total = self.constant
+        for count, sides in self.dice:
+            # A single die is a scalar draw, building an array for it costs more than the roll
+            if count == 1:
+                total += int(rng.integers(1, sides + 1))
+            else:
+                total += int(rng.integers(1, sides + 1, size=count).sum())
+        return total
+
+    # n independent rolls at once as an int64 array
+    def rollMany(self, n, rng=None):
+        if rng is None:
+            rng = RNG
+
+        totals = np.full(n, self.constant, dtype=np.int64)
+        for count, sides in self.dice:
+            totals += rng.integers(1, sides + 1, size=(n, count)).sum(axis=1)
+        return totals
+
+
+@functools.lru_cache(maxsize=None)
+def compileDice(text):
+    dice = []
+    constant = 0
+
+    for term in text.replace(" ", "").split("-"):
+        match = TERM.match(term)
+        if match is None:
+            raise ValueError("Can not read dice term %r in %r" % (term, text))
+
+        count, sides, flat = match.groups()
+        if flat is not None:
+            constant += int(flat)
+        elif int(sides) < 1:
+            raise ValueError("Dice need at least one side in %r" % text)
+        else:
+            dice.append((int(count) if count else 1, int(sides)))
+
+    return DiceRoller(text, tuple(dice), constant)
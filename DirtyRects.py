@@ -0,0 +1,58 @@
+import pygame
+
+
+# Collects the screen regions that changed since the last frame.
+# take() merges overlapping rects and falls back to the whole screen once most of it is dirty anyway,
+# or when there are more pieces than are worth clipping and presenting one by one.
+class DirtyRects:
+
+    def __init__(self, bounds, full_ratio=0.6, max_rects=8):
+        self.bounds = pygame.Rect(bounds)
+        self.fullRatio = full_ratio
+        self.maxRects = max_rects
+        self.rects = []
+        self.full = False
+
+    def __bool__(self):
+        return self.full or len(self.rects) > 0
+
+    def add(self, rect):
+        rect = pygame.Rect(rect).clip(self.bounds)
+        if rect.width > 0 and rect.height > 0:
+            self.rects.append(rect)
+
+    def addAll(self):
+        self.full = True
+
+    def take(self):
+        rects = self.merged()
+        self.rects = []
+        self.full = False
+        return rects
+
+    def merged(self):
+        if self.full:
+            return [self.bounds.copy()]
+
+        merged = []
+        for rect in self.rects:
+            # Swallow every rect this one touches, the union can touch new ones so go again until nothing changes
+            rect = rect.copy()
+            overlapping = True
+            while overlapping:
+                overlapping = False
+                for other in merged:
+                    if rect.colliderect(other):
+                        rect.union_ip(other)
+                        merged.remove(other)
+                        overlapping = True
+                        break
+            merged.append(rect)
+
+        area = sum(rect.width * rect.height for rect in merged)
+        if area > self.bounds.width * self.bounds.height * self.fullRatio:
+            return [self.bounds.copy()]
+        if len(merged) > self.maxRects:
+            return [merged[0].unionall(merged[1:])]
+
+        return merged
@@ -0,0 +1,78 @@
+from Dice import compileDice
+
+
+# Damage types
+PSYCHIC = 0
+BLUNT = PSYCHIC + 1
+PIERCING = BLUNT + 1
+RADIANT = PIERCING + 1
+NECROTIC = RADIANT + 1
+
+DAMAGE_TYPES = {"psychic": PSYCHIC, "blunt": BLUNT, "piercing": PIERCING, "radiant": RADIANT, "necrotic": NECROTIC}
+
+
+# Damage action format: D-Dice-Type-Lethal
+#   Example: D-2d6-psychic-False
+class DamageEffect:
+
+    def __init__(self, action, dice, damage_type, lethal):
+        self.action = action
+        self.dice = compileDice(dice)
+        self.damageType = damage_type
+        self.lethal = lethal
+
+
+# Health action format: H-Dice-Temp
+#   Example: H-8d1-False
+class HealEffect:
+
+    def __init__(self, action, dice, temporary):
+        self.action = action
+        self.dice = compileDice(dice)
+        self.temporary = temporary
+
+
+# Spell action format: S-Name-Level
+#   Example: S-WaterWall-1
+class SpellEffect:
+
+    def __init__(self, action, name, level):
+        self.action = action
+        self.name = name
+        self.level = level
+
+
+def parseDamage(action, info):
+    if info[2].lower() not in DAMAGE_TYPES:
+        raise ValueError("Unknown damage type in %r" % action)
+    return DamageEffect(action, info[1], DAMAGE_TYPES[info[2].lower()], info[3] == "True")
+
+
+def parseHeal(action, info):
+    return HealEffect(action, info[1], info[2] == "True")
+
+
+def parseSpell(action, info):
+    return SpellEffect(action, info[1], int(info[2]))
+
+
+# Action code -> (parser, number of fields after the code)
+PARSERS = {"D": (parseDamage, 3), "H": (parseHeal, 2), "S": (parseSpell, 2)}
+
+
+# Turns an item action string into its effect once, "" means the item does nothing
+def parseAction(action):
+    if action == "":
+        return None
+
+    # Dice can contain "-" themselves (2d6-1d4) so the fields are split off from the right
+    kind, _, rest = action.partition("-")
+    if kind not in PARSERS:
+        raise ValueError("Unknown action %r" % action)
+
+    parser, fields = PARSERS[kind]
+    info = [kind] + rest.rsplit("-", fields - 1)
+    if len(info) != fields + 1 or "" in info:
+        raise ValueError("Action %r needs %d fields" % (action, fields))
+
+    return parser(action, info)
@@ -0,0 +1,61 @@
+import heapq
+import math
+import time
+
+import pygame
+
+
+# Routes pygame events to handlers and sleeps while there is nothing to do.
+# Handlers of an event type are tried in the order they were added until one returns True, so layers that sit on
+# top (buttons, open panels) are added before the map underneath them. Event types without a handler are dropped
+# without waking the caller, callbacks scheduled with after() wake it once they are due.
+class EventDispatcher:
+
+    def __init__(self):
+        self.handlers = {}
+        self.timers = []
+        self.scheduled = 0
+
+    def on(self, event_type, handler):
+        self.handlers.setdefault(event_type, []).append(handler)
+
+    def dispatch(self, event):
+        for handler in self.handlers.get(event.type, ()):
+            if handler(event):
+                return True
+        return False
+
+    # Runs callback once, delay milliseconds from now
+    def after(self, delay, callback):
+        # scheduled breaks ties so callbacks due at the same time run in the order they were added
+        heapq.heappush(self.timers, (time.perf_counter() + delay / 1000, self.scheduled, callback))
+        self.scheduled += 1
+
+    def isScheduled(self, callback):
+        return any(timer[2] is callback for timer in self.timers)
+
+    def due(self):
+        return len(self.timers) > 0 and self.timers[0][0] <= time.perf_counter()
+
+    def runTimers(self):
+        while self.due():
+            heapq.heappop(self.timers)[2]()
+
+    def pending(self):
+        return [event for event in pygame.event.get() if event.type in self.handlers]
+
+    # Events that have a handler, blocks until there is at least one or a timer is due.
+    # With busy set (work is already waiting) it only collects what is queued.
+    def wait(self, busy=False):
+        events = self.pending()
+        while len(events) == 0 and not busy and not self.due():
+            if len(self.timers) > 0:
+                event = pygame.event.wait(max(1, math.ceil((self.timers[0][0] - time.perf_counter()) * 1000)))
+            else:
+                event = pygame.event.wait()
+
+            events = [event] if event.type in self.handlers else []
+            events += self.pending()
+
+        self.runTimers()
+        return events
@@ -0,0 +1,1573 @@
+import hashlib
+import math
+import numpy as np
+import os
+import pygame
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from Atlas import Atlas, SpriteBatch
+from Dice import compileDice
+from DirtyRects import DirtyRects
+from Effects import DamageEffect, HealEffect, SpellEffect, parseAction
+from Events import EventDispatcher
+from Grid import Grid, HIGHLIGHTED, SELECTED, BLOCKER, TERRAIN_CHANGED, CONTENTS_CHANGED
+from Inventory import Inventory
+from Pathfinding import MovementCache, PathCache, findReachableMany
+from Profiler import FrameProfiler
+from Registry import Registry
+from Save import HAS_SEED, NO_OWNER, VERSION, ENTITY_RECORD, SaveFile, SaveHeader, SavedTerrain, appendSave, \
+    writeSave
+from Text import FontCache, TextCache
+from Viewport import ChunkCache, tilePositions, visibleTiles
+from Visibility import FieldOfViewCache, lineOfSightMany
+from World import ChunkedWorld
+
+
+# Constants
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 800
+SCREEN_CENTER_X = SCREEN_WIDTH / 2
+SCREEN_CENTER_Y = SCREEN_HEIGHT / 2
+TILE_SIZE = int(SCREEN_WIDTH / 24)
+HALF_TILE = int(TILE_SIZE / 2)
+TILES_X = SCREEN_WIDTH / TILE_SIZE
+TILES_Y = SCREEN_HEIGHT / TILE_SIZE
+OUTLINE_SIZE = int(TILE_SIZE / 25 + 1)
+OUTLINE_COLOR = (20, 20, 20)
+SELECTION_COLOR = (225, 220, 50)
+BASE_MOVEMENT_COST = 5
+# How many tiles away characters can see
+SIGHT_RADIUS = 8
+CHUNK_SIZE = 8
+# Generated worlds, only the chunks around the camera are kept in memory
+WORLD_SIZE = 1 << 16
+WORLD_CHUNK_SIZE = 32
+DIRT_PATCHES = 0.02
+# Trees draw a little past the bottom of their tile so redrawn tiles take some margin with them
+DIRTY_MARGIN = int(TILE_SIZE / 8)
+# Frame timings are drawn here while debugging
+OVERLAY_RECT = (SCREEN_WIDTH - 330, 10, 320, 160)
+
+INACTIVE = (240, 175, 100)
+ACTIVE = (100, 255, 100)
+DANGER = (240, 100, 100)
+
+# Directions
+LEFT = 0
+UP = 1
+RIGHT = 2
+DOWN = 3
+
+# Pygame, screen and assets are set up by init
+screen = None
+clock = None
+font = 'freesansbold.ttf'
+DIRTY = DirtyRects((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+TEXT_CACHE = TextCache()
+FONT_CACHE = FontCache()
+PROFILER = FrameProfiler()
+
+
+# Pygame self-made functions
+def fitTextSize(font, rect, text, inc=4):
+    return FONT_CACHE.fit(font, rect, text, inc)
+
+
+# Assets and asset constants
+# Assets.txt is only read up front, images are scaled on first use or by prefetch on a thread pool.
+# Scaled images are kept in cache_dir keyed by the source file, its mtime and TILE_SIZE so later starts skip smoothscale
+class AssetManager:
+
+    def __init__(self, file_name=ROOT + '/Assets/Assets.txt', extensions=".png", cache_dir=ROOT + "/.asset_cache",
+                 workers=4):
+        file = open(file_name, 'r')
+
+        lines = file.read().split("\n")
+
+        self.highlighted = {}
+        self.assets = {}
+        self.entries = {}
+        self.pending = {}
+        self.cacheDir = cache_dir
+        self.workers = workers
+        self.pool = None
+        self.lock = threading.Lock()
+
+        for line in lines:
+            if len(line) > 2:
+                contents = line.split("=")
+
+                location = ROOT + "/Assets/"
+                if contents[0].__eq__("Item"):
+                    location = ROOT + "/Assets/Items/"
+
+                name = contents[1]
+                asset_file = location + name + extensions
+                highlighted_file = location + "Highlighted/" + name + extensions
+
+                width = int(float(contents[2]) * TILE_SIZE)
+                height = int(float(contents[3]) * TILE_SIZE)
+
+                self.entries[name] = (asset_file, highlighted_file, (width, height))
+
+    def get(self, name):
+        if name not in self.assets:
+            self.load(name)
+        return self.assets[name]
+
+    def getH(self, name):
+        if name not in self.highlighted:
+            self.load(name)
+        return self.highlighted[name]
+
+    def load(self, name):
+        with self.lock:
+            if name in self.assets:
+                return
+
+            # Already being loaded by prefetch, wait for it instead of doing the work twice. Otherwise a placeholder
+            # is registered so a prefetch started meanwhile skips this asset.
+            future = self.pending.get(name)
+            if future is None:
+                owner = True
+                future = self.pending[name] = Future()
+            else:
+                owner = False
+
+        if not owner:
+            future.result()
+            return
+
+        try:
+            self.loadNow(name)
+        except Exception as error:
+            with self.lock:
+                self.pending.pop(name, None)
+            future.set_exception(error)
+            raise
+        future.set_result(None)
+
+    # Starts loading the given assets, all of them by default, in the background
+    def prefetch(self, names=None):
+        if names is None:
+            names = list(self.entries.keys())
+
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.workers)
+
+        with self.lock:
+            for name in names:
+                if name not in self.assets and name not in self.pending:
+                    self.pending[name] = self.pool.submit(self.loadNow, name)
+
+    # Drops prefetches that have not started and waits for the running ones so the interpreter can exit
+    def shutdown(self):
+        if self.pool is None:
+            return
+
+        with self.lock:
+            for name, future in list(self.pending.items()):
+                if future.cancel():
+                    del self.pending[name]
+        self.pool.shutdown(wait=True)
+        self.pool = None
+
+    def loadNow(self, name):
+        asset_file, highlighted_file, size = self.entries[name]
+        image = self.loadScaled(asset_file, size)
+        highlighted = self.loadScaled(highlighted_file, size)
+
+        with self.lock:
+            self.assets[name] = image
+            self.highlighted[name] = highlighted
+            self.pending.pop(name, None)
+
+    def cacheFile(self, source, size):
+        stamp = "%s:%d:%d:%dx%d" % (os.path.abspath(source), os.stat(source).st_mtime_ns, TILE_SIZE, size[0], size[1])
+        digest = hashlib.sha1(stamp.encode()).hexdigest()[:16]
+        return os.path.join(self.cacheDir, "%s-%s.rgba" % (os.path.splitext(os.path.basename(source))[0], digest))
+
+    def loadScaled(self, source, size):
+        cached = self.cacheFile(source, size)
+
+        if os.path.exists(cached):
+            with open(cached, "rb") as file:
+                data = file.read()
+
+            # A truncated or foreign file does not match the size, it is decoded again and rewritten
+            try:
+                return pygame.image.frombytes(data, size, "RGBA")
+            except ValueError:
+                pass
+
+        image = pygame.transform.smoothscale(pygame.image.load(source), size)
+
+        # Written under a temporary name first so a half written file is never picked up
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            temporary = "%s.%d.tmp" % (cached, threading.get_ident())
+            with open(temporary, "wb") as file:
+                file.write(pygame.image.tobytes(image, "RGBA"))
+            os.replace(temporary, cached)
+        except OSError:
+            pass
+
+        return image
+
+
+# Sprites are keyed by (asset name, highlighted), the player has a key of its own
+PLAYER_SPRITE = ("Player", False)
+
+
+def loadSprite(key):
+    if key == PLAYER_SPRITE:
+        return PLAYER_IMAGE
+    if key[1]:
+        return ASSET_MANAGER.getH(key[0])
+    return ASSET_MANAGER.get(key[0])
+
+
+ASSET_MANAGER = None
+SPRITES = Atlas(loadSprite)
+SPRITE_BATCH = SpriteBatch(SPRITES)
+PLAYER_IMAGE = None
+PLAYER_WIDTH = 0
+PLAYER_HEIGHT = 0
+HIGHLIGHTED_TILE = None
+
+
+# Starts pygame, opens the window and loads assets. Importing this module has no side effects so game logic
+# can run without any of it, headless swaps in SDL's dummy drivers so drawing works on machines without a display
+def init(headless=False):
+    global screen, clock, ASSET_MANAGER, PLAYER_IMAGE, PLAYER_WIDTH, PLAYER_HEIGHT, HIGHLIGHTED_TILE
+
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    pygame.init()
+    screen = pygame.display.set_mode([SCREEN_WIDTH, SCREEN_HEIGHT])
+    pygame.display.set_caption("0.0")
+    clock = pygame.time.Clock()
+
+    # Load assets
+    ASSET_MANAGER = AssetManager()
+    ASSET_MANAGER.prefetch()
+    PLAYER_IMAGE = pygame.transform.smoothscale(pygame.image.load(ROOT + "/Player.png"),
+                                                (int(TILE_SIZE * 0.55), int(TILE_SIZE * 0.75)))
+    PLAYER_WIDTH = PLAYER_IMAGE.get_width()
+    PLAYER_HEIGHT = PLAYER_IMAGE.get_height()
+    HIGHLIGHTED_TILE = pygame.Surface((TILE_SIZE, TILE_SIZE))
+    HIGHLIGHTED_TILE.fill((255, 125, 125))
+    HIGHLIGHTED_TILE.set_alpha(150)
+
+
+class Terrain:
+
+    def __init__(self, difficulty, color=()):
+        self.difficulty = difficulty
+        self.color = color
+
+    def getColor(self):
+        return self.color
+
+
+GrassLand = Terrain(1, (100, 255, 150))
+DirtRoad = Terrain(0.75, (115, 90, 75))
+TERRAINS = [GrassLand, DirtRoad]
+
+
+# Rolls a string i.e. 1d6 -> 1 roll 1-6
+def roll(s):
+    return compileDice(str(s)).roll()
+
+
+def strToAmount(s):
+    return compileDice(str(s)).roll()
+
+
+OIDS = Registry()
+
+
+def getMyOID(obj):
+    return OIDS.add(obj)
+
+
+def getObject(oid):
+    return OIDS.get(oid)
+
+
+class Object:
+
+    def __init__(self, Blocking=True):
+        self.selected = False
+        self.blocking = Blocking
+        self.OID = getMyOID(self)
+
+    def isBlocking(self):
+        return self.blocking
+
+    # Frees the OID for reuse once the object leaves the game, it can no longer be looked up by it
+    def release(self):
+        if self.OID is not None:
+            OIDS.remove(self.OID)
+            self.OID = None
+
+    # toggleSelect never runs because Tile has its own and that is the only one that will run
+    def toggleSelect(self):
+        global selected
+
+        if selected is not None and selected is not self:
+            selected.deselect()
+
+        if self.selected:
+            self.deselect()
+        else:
+            self.select()
+
+        if not self.selected:
+            selected = None
+        else:
+            selected = self
+
+    def deselect(self):
+        global selected
+
+        if self.selected:
+            selected = None
+
+        self.selected = False
+        markObjectDirty(self)
+
+    def select(self):
+        global selected
+
+        self.selected = True
+        selected = self
+        markObjectDirty(self)
+
+    def isSelected(self):
+        return self.selected
+
+
+class Item(Object):
+
+    def __init__(self, type_name, wg, val, name=None, action="H-1d10-False"):
+        super().__init__(Blocking=False)
+
+        if name is not None:
+            self.name = name
+        else:
+            self.name = type_name + type_name + type_name
+
+        self.type = type_name
+        self.weight = wg
+        self.value = val
+        self.action = action
+        self.effect = parseAction(action)
+        self.inInventory = False
+        self.equipped = False
+
+    def equip(self):
+        self.equipped = True
+
+    def unequip(self):
+        self.equipped = False
+
+    def getName(self):
+        return self.name
+
+    def pickUp(self):
+        self.inInventory = True
+
+    def place(self, x, y):
+        global tiles
+
+        self.inInventory = False
+
+        tiles[x][y].addContent(self)
+
+    def handleClick(self):
+        return self.effect
+
+    def draw(self, x, y):
+        if self.inInventory and not self.equipped:
+            return
+
+        x_adjust = int((TILE_SIZE - PLAYER_WIDTH) / 2)
+        y_adjust = int((TILE_SIZE - PLAYER_HEIGHT) / 2)
+
+        SPRITE_BATCH.add((self.type, self.selected), (x + x_adjust, y + y_adjust))
+
+
+class SunGlasses(Item):
+
+    def __init__(self):
+        super().__init__("Sunglasses", 1, 2)
+
+
+class Character(Object):
+
+    def __init__(self, pos, mvmt=30):
+        super().__init__()
+        self.movement = mvmt + BASE_MOVEMENT_COST
+        self.spellCaster = True
+        self.x = pos[0]
+        self.y = pos[1]
+        self.items = Inventory()
+        self.highlightedTiles = None
+        # Tiles walked through on the last move, start and end included, None when it was not routed
+        self.path = None
+
+    def equip(self, item):
+        self.items.equip(item)
+        item.equip()
+        markObjectDirty(self)
+
+    def unequip(self, item):
+        self.items.unequip(item)
+        item.unequip()
+        markObjectDirty(self)
+
+    def isSpellCaster(self):
+        return self.spellCaster
+
+    # Takes item off whichever tile it lies on
+    def pickUp(self, item):
+        row, col = tiles.locate(item)
+        tiles.removeContent(row, col, item)
+        self.items.add(item)
+        item.pickUp()
+
+    def get(self, item):
+        self.items.add(item)
+        item.pickUp()
+
+    # Puts item down on this character's tile, taking it off first if it was equipped
+    def drop(self, item):
+        if self.items.isEquipped(item):
+            self.unequip(item)
+        self.items.remove(item)
+        item.place(self.x, self.y)
+
+    def select(self):
+        super().select()
+
+    def deselect(self):
+        super().deselect()
+
+    def moveTo(self, tile, path=None):
+        self.path = path
+        self.x = tile[0]
+        self.y = tile[1]
+
+    def highlight(self):
+        self.highlightedTiles = self.findTilesToMoveTo(self.x, self.y)
+        for p in self.highlightedTiles:
+            tiles[p[0]][p[1]].highlight()
+
+    def unHighlight(self):
+        # Clear exactly what highlight lit up even if the map changed in between
+        pos = self.highlightedTiles
+        if pos is None:
+            pos = self.findTilesToMoveTo(self.x, self.y)
+        for p in pos:
+            tiles[p[0]][p[1]].unHighlight()
+        self.highlightedTiles = None
+
+    def findTilesToMoveTo(self, x, y):
+        return MOVEMENT_CACHE.get(tiles.difficulty, x, y, self.movement, BASE_MOVEMENT_COST)
+
+    # Cheapest route to tile within this character's movement going around blockers, None when there is none
+    def findPathTo(self, tile):
+        path, cost = PATH_CACHE.get(tiles.difficulty, isBlocked, (self.x, self.y), tile, BASE_MOVEMENT_COST,
+                                    float(tiles.terrainCosts.min()), self.movement)
+        return path
+
+    # Tiles this character can see from where it stands, blocking objects hide what is behind them
+    def findVisibleTiles(self, radius=SIGHT_RADIUS):
+        return FOV_CACHE.get(isBlocked, self.x, self.y, radius, tiles.rows, tiles.cols)
+
+    def canSee(self, tile):
+        return tuple(tile) in self.findVisibleTiles()
+
+    def draw(self, x, y):
+        x_adjust = int((TILE_SIZE - PLAYER_WIDTH) / 2)
+        y_adjust = int((TILE_SIZE - PLAYER_HEIGHT) / 2)
+
+        SPRITE_BATCH.add(PLAYER_SPRITE, (x + x_adjust, y + y_adjust))
+
+        for item in self.items.equippedItems():
+            item.draw(x, y)
+
+    # Gets the effect of every equipped item, action formats are described in Effects.py
+    def handleClick(self, x, y):
+        for item in self.items.equippedItems():
+            effect = item.handleClick()
+            if effect is None:
+                continue
+
+            self.effectHandlers[type(effect)](self, effect)
+
+    # Characters have no health yet so damage and healing are left unrolled until there is something to apply them to
+    def handleDamage(self, effect):
+        pass
+
+    def handleHeal(self, effect):
+        pass
+
+    def handleSpell(self, effect):
+        pass
+
+
+Character.effectHandlers = {DamageEffect: Character.handleDamage,
+                            HealEffect: Character.handleHeal,
+                            SpellEffect: Character.handleSpell}
+
+
+class Tree(Object):
+
+    def __init__(self, bc=(135, 75, 0), lc=(0, 135, 25)):
+        super().__init__()
+        self.baseColor = bc
+        self.leavesColor = lc
+        self.bWidth = int(TILE_SIZE / 8 + 2)
+        self.bHeight = int(TILE_SIZE / 4 + 2)
+        self.lWidth = int(TILE_SIZE / 4 + 2)
+        self.lHeight = int(TILE_SIZE / 1.25 + 2)
+
+    def draw(self, x, y):
+        # Sprites queued before this tree have to land underneath it
+        SPRITE_BATCH.flush(screen)
+
+        tileCenterX = x + HALF_TILE
+        pygame.draw.rect(screen, self.baseColor, (int(tileCenterX - self.bWidth), y + int(TILE_SIZE * 0.8),
+                                                  int(self.bWidth * 2), self.bHeight))
+        pygame.draw.polygon(screen, self.leavesColor, ((tileCenterX, int(y + TILE_SIZE * 0.0375)),
+                                                       (tileCenterX - self.lWidth, y + int(TILE_SIZE * 0.8)),
+                                                       (tileCenterX + self.lWidth, y + int(TILE_SIZE * 0.8))))
+
+        if self.selected:
+            pygame.draw.rect(screen, self.baseColor, (int(tileCenterX - self.bWidth), y + int(TILE_SIZE * 0.8),
+                                                      int(self.bWidth * 2), self.bHeight), OUTLINE_SIZE)
+            pygame.draw.polygon(screen, SELECTION_COLOR, ((tileCenterX, y + TILE_SIZE * 0.0375),
+                                                          (tileCenterX - self.lWidth, y + int(TILE_SIZE * 0.8)),
+                                                          (tileCenterX + self.lWidth, y + int(TILE_SIZE * 0.8))),
+                                OUTLINE_SIZE)
+
+
+# A view over one cell of the Grid, every bit of state lives in the grid arrays.
+# Tiles are addressed by position so they do not take an OID.
+class Tile(Object):
+    OID = None
+    blocking = True
+
+    def __init__(self, grid, row, col):
+        self.grid = grid
+        self.row = row
+        self.col = col
+
+    def __eq__(self, other):
+        return isinstance(other, Tile) and (self.grid, self.row, self.col) == (other.grid, other.row, other.col)
+
+    def __hash__(self):
+        return hash((self.row, self.col))
+
+    # Tile.x is the column and Tile.y the row, tiles are indexed [row][column]
+    @property
+    def x(self):
+        return self.col
+
+    @property
+    def y(self):
+        return self.row
+
+    @property
+    def terrain(self):
+        return self.grid.getTerrain(self.row, self.col)
+
+    @property
+    def color(self):
+        return self.terrain.color
+
+    @property
+    def difficulty(self):
+        return float(self.grid.difficulty[self.row, self.col])
+
+    @property
+    def contents(self):
+        return self.grid.getContents(self.row, self.col)
+
+    @property
+    def connections(self):
+        grid = self.grid
+        return [grid.tile(self.row, self.col + 1), grid.tile(self.row + 1, self.col),
+                grid.tile(self.row, self.col - 1), grid.tile(self.row - 1, self.col)]
+
+    @property
+    def selected(self):
+        return self.grid.getFlag(self.row, self.col, SELECTED)
+
+    @selected.setter
+    def selected(self, value):
+        self.grid.setFlag(self.row, self.col, SELECTED, value)
+
+    @property
+    def highlighted(self):
+        return self.grid.getFlag(self.row, self.col, HIGHLIGHTED)
+
+    @highlighted.setter
+    def highlighted(self, value):
+        self.grid.setFlag(self.row, self.col, HIGHLIGHTED, value)
+
+    @property
+    def selectedItem(self):
+        return self.grid.selectedItems.get((self.row, self.col), 0)
+
+    @selectedItem.setter
+    def selectedItem(self, value):
+        if value:
+            self.grid.selectedItems[(self.row, self.col)] = value
+        else:
+            self.grid.selectedItems.pop((self.row, self.col), None)
+
+    def addContent(self, obj):
+        self.grid.addContent(self.row, self.col, obj)
+
+    def removeContent(self, obj):
+        self.grid.removeContent(self.row, self.col, obj)
+
+    # Only terrain changes the cost of a range, what lies on a tile never does
+    def setTerrain(self, terrain):
+        self.grid.setTerrain(self.row, self.col, terrain)
+
+    def containsBlocker(self):
+        return self.grid.getFlag(self.row, self.col, BLOCKER)
+
+    def toggleSelect(self):
+        global selected
+
+        # Contents can be selected
+        if len(self.contents) > 0:
+            # Deselection
+
+            # Already selected tile so deselect and move selection to first item
+            if self.selected and self.selectedItem == len(self.contents):
+                self.selected = False
+                self.selectedItem = 0
+
+            # Already selected item so move to next one
+            if self.selectedItem < len(self.contents) and self.contents[self.selectedItem].isSelected():
+                self.selectedItem += 1
+
+            # Selection
+
+            # Selection tile is the tile itself
+            if self.selectedItem == len(self.contents):
+                if selected is not None:
+                    selected.deselect()
+                self.selected = True
+                selected = self
+
+            # Selection is the contents of the tile
+            if self.selectedItem < len(self.contents) and not self.contents[self.selectedItem].isSelected():
+                if selected is not None:
+                    selected.deselect()
+                self.contents[self.selectedItem].select()
+
+        # No contents to select
+        else:
+            self.selected = not self.selected
+
+            if self.selected:
+                if selected is not None:
+                    selected.deselect()
+                selected = self
+
+            else:
+                selected = None
+
+    def highlight(self):
+        self.highlighted = True
+
+    def unHighlight(self):
+        self.highlighted = False
+
+    def isHighlighted(self):
+        return self.highlighted
+
+    # Terrain, highlight and outline, this is what map chunks are made of
+    def paint(self, surface, x_cords, y_cords, outline=True):
+        pygame.draw.rect(surface, self.color, (x_cords, y_cords, TILE_SIZE, TILE_SIZE))
+
+        if self.highlighted:
+            surface.blit(HIGHLIGHTED_TILE, (x_cords, y_cords))
+
+        if outline:
+            if self.selected:
+                pygame.draw.rect(surface, SELECTION_COLOR, (x_cords, y_cords, TILE_SIZE, TILE_SIZE), OUTLINE_SIZE)
+            else:
+                pygame.draw.rect(surface, OUTLINE_COLOR, (x_cords, y_cords, TILE_SIZE, TILE_SIZE), OUTLINE_SIZE)
+
+    def draw(self, x_cords, y_cords, outline=True):
+        self.paint(screen, x_cords, y_cords, outline)
+
+        for content in self.contents:
+            content.draw(x_cords, y_cords)
+        SPRITE_BATCH.flush(screen)
+
+
+class Button:
+
+    def __init__(self, rct, txt, color, txt_color, font_to_use):
+        self.labelPos = (int(rct[0] + rct[2] / 2 - font_to_use.size(txt)[0] / 2),
+                         int(rct[1] + rct[3] / 2 - font_to_use.size(txt)[1] / 2))
+        self.labelText = TEXT_CACHE.render(font_to_use, txt, True, txt_color)
+        self.txt = txt
+
+        self.color = color
+        self.rect = rct
+        self.hidden = False
+
+    def draw(self):
+        if self.hidden:
+            return
+
+        pygame.draw.rect(screen, self.color, self.rect)
+        pygame.draw.rect(screen, OUTLINE_COLOR, self.rect, OUTLINE_SIZE)
+
+        if self.txt != "":
+            screen.blit(self.labelText, self.labelPos)
+
+    def handleClick(self, pressed, location):
+        if self.rect[0] < location[0] < self.rect[0] + self.rect[2] and \
+                self.rect[1] < location[1] < self.rect[1] + self.rect[3]:
+            return True
+        return False
+
+    def markDirty(self):
+        DIRTY.add(self.rect)
+
+    def updateTxtColor(self, color, font):
+        self.labelText = TEXT_CACHE.render(font, self.txt, True, color)
+        self.markDirty()
+
+
+class Slider:
+
+    def __init__(self, pointA, pointB, color, size, pos=0.0, colorPoint=(0, 0, 0)):
+        self.a = pointA
+        self.b = pointB
+        self.xDiff = (pointB[0] - pointA[0])
+        self.yDiff = (pointB[1] - pointA[1])
+        self.c = math.sqrt(self.xDiff ** 2 + self.yDiff ** 2)
+        self.size = int(size)
+        self.barSize = int(size * 0.8)
+        self.color = color
+        self.pos = pos
+        self.colorPos = colorPoint
+        self.rect = pygame.Rect(min(pointA[0], pointB[0]), min(pointA[1], pointB[1]),
+                                abs(self.xDiff) + 1, abs(self.yDiff) + 1).inflate(self.size * 2 + 2, self.size * 2 + 2)
+
+    def getPos(self):
+        return self.pos
+
+    def markDirty(self):
+        DIRTY.add(self.rect)
+
+    def draw(self):
+        #  Draw Bar
+        pygame.draw.line(screen, self.color, self.a, self.b, self.barSize)
+
+        #  Draw Picker
+        p_cords = [int(self.a[0] + self.xDiff * self.pos), int(self.a[1] + self.yDiff * self.pos)]
+        pygame.draw.circle(screen, self.colorPos, p_cords, self.size)
+
+    def handle_mouse(self, mouse):
+        distance = math.fabs((self.xDiff * (self.b[1] - mouse[1])) - (self.yDiff * (self.b[0] - mouse[0]))) / self.c
+
+        if distance < self.size:
+            pos = ((mouse[0] - self.a[0]) ** 2 + (mouse[1] - self.a[1]) ** 2) ** 0.5 / self.c
+
+            if pos > 1:
+                pos = 1
+
+            if pos != self.pos:
+                self.pos = pos
+                self.markDirty()
+
+        return distance < self.size
+
+
+# Pages through an Inventory one row per stack, sorted by sort (see Inventory.SORT_FIELDS)
+class ListDisplay:
+
+    def __init__(self, LOI, rct=(int(SCREEN_WIDTH / 20), int(SCREEN_HEIGHT / 20),
+                                 int(SCREEN_WIDTH / 3), int(SCREEN_HEIGHT / 20 * 18)),
+                 txt="", txt_color=(75, 75, 75), target=None, sort="name"):
+        self.LOI = LOI
+        self.sort = sort
+        self.rect = rct
+
+        labelRect = (rct[0] + rct[2] * 0.1, rct[1] + rct[3] * 0.01, rct[2] * 0.8, rct[3] * 0.08)
+        labelFont = fitTextSize(font, labelRect, txt)
+        self.labelPos = (int(labelRect[0] + labelRect[2] / 2 - labelFont.size(txt)[0] / 2),
+                         int(labelRect[1] + labelRect[3] / 2 - labelFont.size(txt)[1] / 2))
+        self.labelText = TEXT_CACHE.render(labelFont, txt, True, txt_color)
+        self.txt_color = txt_color
+        self.numberColor = (int(txt_color[0] * 0.8), int(txt_color[1] * 0.8), int(txt_color[2] * 0.8))
+
+        self.lineOne = (int(rct[0]), int(rct[1] + rct[3] * 0.1))
+        self.lineTwo = (int(rct[0] + rct[2]), int(rct[1] + rct[3] * 0.1))
+
+        self.slider = Slider((int(rct[0] + rct[2] * 0.97), int(rct[1] + rct[3] * 0.2)), (int(rct[0] + rct[2] * 0.97), int(rct[1] + rct[3] * 0.8)),
+                             (200, 200, 200), int(rct[2] * 0.03), colorPoint=(225, 225, 225))
+
+        self.amountOfItemsToDisplay = 15
+        self.itemsTop = int(rct[1] + rct[3] * 0.1)
+        self.itemsIncY = int(rct[3] * 0.9 / self.amountOfItemsToDisplay)
+        self.itemsX = int(rct[0] + rct[2] * 0.1)
+        self.itemsWidth = int(rct[2] * 0.8)
+
+        self.characterLimit = 10
+
+        self.font = fitTextSize(font, (self.itemsX, self.itemsTop, self.itemsWidth, self.itemsIncY * 0.8), "G")
+        self.textOffsetY = int(self.itemsIncY / 2 - self.font.size("A")[1] / 2)
+        self.page = 0
+        self.rows = []
+
+        self.buttons = []
+        for x in range(self.amountOfItemsToDisplay):
+            self.buttons.append((Button((int(self.itemsX + self.itemsWidth * 0.59), int(self.itemsTop + self.itemsIncY * x), int(self.itemsWidth / 5), self.itemsIncY), "Use", (25, 25, 25), INACTIVE, self.font),
+                                 Button((int(self.itemsX + self.itemsWidth * 0.6 + self.itemsWidth / 5), int(self.itemsTop + self.itemsIncY * x), int(self.itemsWidth / 4),  self.itemsIncY), "Drop", (25, 25, 25), DANGER, self.font)))
+        self.useColors = [INACTIVE] * self.amountOfItemsToDisplay
+
+        self.refresh()
+        self.markDirty()
+
+    # The whole panel goes back on screen, rows shift around whenever the page or the items change.
+    # Its divider lines are thick enough to poke past the panel edge
+    def markDirty(self):
+        DIRTY.add(pygame.Rect(self.rect).inflate(OUTLINE_SIZE * 2, OUTLINE_SIZE * 2))
+
+    def draw(self):
+        pygame.draw.rect(screen, (150, 150, 150), self.rect)
+        pygame.draw.rect(screen, OUTLINE_COLOR, self.rect, OUTLINE_SIZE)
+        screen.blit(self.labelText, self.labelPos)
+        pygame.draw.line(screen, OUTLINE_COLOR, self.lineOne, self.lineTwo, OUTLINE_SIZE)
+
+        self.refresh()
+
+        for count in range(self.amountOfItemsToDisplay):
+            self.buttons[count][0].draw()
+            self.buttons[count][1].draw()
+
+            pygame.draw.line(screen, OUTLINE_COLOR, (self.itemsX, self.itemsTop + self.itemsIncY * count),
+                             (self.itemsX + self.itemsWidth, self.itemsTop + self.itemsIncY * count), OUTLINE_SIZE)
+
+            textY = self.itemsTop + self.itemsIncY * count + self.textOffsetY
+            text = TEXT_CACHE.render(self.font, str(count + self.page * self.amountOfItemsToDisplay + 1), True,
+                                     self.numberColor)
+            screen.blit(text, (self.itemsX - text.get_width(), textY))
+
+            if count >= len(self.rows):
+                continue
+
+            stack = self.rows[count]
+            text = TEXT_CACHE.render(self.font, stack.name[:self.characterLimit], True, self.txt_color)
+            screen.blit(text, (self.itemsX, textY))
+
+            # Quantity right before the buttons for stacks of more than one
+            if len(stack) > 1:
+                text = TEXT_CACHE.render(self.font, "x%d" % len(stack), True, self.numberColor)
+                screen.blit(text, (int(self.itemsX + self.itemsWidth * 0.58) - text.get_width(), textY))
+
+        self.slider.draw()
+
+    # Picks the stacks on the page the slider points at and lights the Use button of the ones with something equipped
+    def refresh(self):
+        pages = int(self.LOI.stackCount() / self.amountOfItemsToDisplay + 1)
+
+        self.page = math.floor(self.slider.getPos() / (1 / pages))
+        if self.page == pages:
+            self.page = pages - 1
+
+        self.rows = self.LOI.sortedBy(self.sort, self.page * self.amountOfItemsToDisplay,
+                                      (self.page + 1) * self.amountOfItemsToDisplay)
+
+        for count in range(self.amountOfItemsToDisplay):
+            color = ACTIVE if count < len(self.rows) and self.rows[count].equipped > 0 else INACTIVE
+            if color != self.useColors[count]:
+                self.useColors[count] = color
+                self.buttons[count][0].updateTxtColor(color, self.font)
+
+    def handleMouse(self, loc, pressed):
+        yBool = (self.rect[1] < loc[1] < self.rect[1] + self.rect[3])
+        xBool = (self.rect[0] < loc[0] < self.rect[0] + self.rect[2])
+
+        if not xBool or not yBool:
+            return 0
+        else:
+            if self.slider.handle_mouse(loc):
+                self.markDirty()
+                return 2
+
+            # Use takes off an equipped item of the stack if there is one and puts one on otherwise, so a character
+            # wears at most one item of a stack. Drop puts down an item that is not equipped while there are any
+            for num in range(self.amountOfItemsToDisplay):
+                if self.buttons[num][0].handleClick(pressed, loc):
+                    if num < len(self.rows):
+                        stack = self.rows[num]
+                        if stack.equipped > 0:
+                            selected.unequip(stack.pick(equipped=True))
+                        else:
+                            selected.equip(stack.pick())
+                        self.refresh()
+                        return 2
+                if self.buttons[num][1].handleClick(pressed, loc):
+                    if num < len(self.rows):
+                        stack = self.rows[num]
+                        selected.drop(stack.pick() or stack.pick(equipped=True))
+                        self.refresh()
+                        self.markDirty()
+                    return 2
+
+            return 1
+
+
+# Collections
+tiles = None
+camera = None
+MAP_CHUNKS = None
+MOVEMENT_CACHE = MovementCache()
+PATH_CACHE = PathCache()
+FOV_CACHE = FieldOfViewCache()
+showCharacterButtons = False
+characterButtons = []
+MainCharacter = None
+ButtonFont = None
+# Save chunks whose terrain changed since the last save and the save the map was last loaded from or saved to
+UNSAVED_CHUNKS = set()
+SAVED = None
+
+
+def markTileDirty(row, col):
+    for x_cords, y_cords in tilePositions(row, col, camera, tiles.rows, tiles.cols,
+                                          SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE):
+        DIRTY.add(pygame.Rect(x_cords, y_cords, TILE_SIZE, TILE_SIZE).inflate(DIRTY_MARGIN * 2, DIRTY_MARGIN * 2))
+
+
+# Tiles report through the grid listener, objects lying on a tile redraw that tile
+def markObjectDirty(obj):
+    if tiles is None:
+        return
+
+    position = tiles.locate(obj)
+    if position is not None:
+        markTileDirty(position[0], position[1])
+
+
+def setCharacterButtons(show):
+    global showCharacterButtons
+
+    if show != showCharacterButtons:
+        showCharacterButtons = show
+        for button in characterButtons:
+            button.markDirty()
+
+
+# Keeps cached movement ranges and the screen in step with the map
+def onTileChanged(row, col, change):
+    markTileDirty(row, col)
+
+    if change == CONTENTS_CHANGED:
+        PATH_CACHE.invalidate(row, col)
+        FOV_CACHE.invalidate(row, col)
+    elif change == TERRAIN_CHANGED:
+        UNSAVED_CHUNKS.add((row // WORLD_CHUNK_SIZE, col // WORLD_CHUNK_SIZE))
+        PATH_CACHE.invalidate(row, col)
+
+        # A cheaper tile can extend ranges that only reached its neighbours
+        MOVEMENT_CACHE.invalidate(row, col)
+        for tile in tiles[row][col].connections:
+            MOVEMENT_CACHE.invalidate(tile.row, tile.col)
+
+
+# Movement ranges of many characters at once, one boolean mask per character.
+# masks[i] is a window of the map with origins[i] as its top left tile, see findReachableMany
+def movementRanges(characters):
+    masks, remaining, origins = findReachableMany(tiles.difficulty, [(c.x, c.y, c.movement) for c in characters],
+                                                  BASE_MOVEMENT_COST, float(tiles.terrainCosts.min()))
+    return masks, origins
+
+
+# Whether each observer can see its target in one pass, pairs are (observer row, col, target row, col).
+# Checks the straight line between the two so it can disagree with findVisibleTiles at the edge of a shadow.
+def lineOfSight(pairs):
+    return lineOfSightMany(tiles.flags, BLOCKER, pairs)
+
+
+# Which of the other characters each character can see, character -> list of the ones in sight
+def charactersInSight(characters, radius=SIGHT_RADIUS):
+    positions = np.array([(c.x, c.y) for c in characters], dtype=np.int64).reshape(-1, 2)
+    dRow = np.abs(positions[:, None, 0] - positions[None, :, 0]) % tiles.rows
+    dCol = np.abs(positions[:, None, 1] - positions[None, :, 1]) % tiles.cols
+    distance = np.maximum(np.minimum(dRow, tiles.rows - dRow), np.minimum(dCol, tiles.cols - dCol))
+    np.fill_diagonal(distance, radius + 1)
+    observers, targets = np.nonzero(distance <= radius)
+
+    inSight = lineOfSight(np.concatenate([positions[observers], positions[targets]], axis=1))
+    seen = {observer: [] for observer in characters}
+    for observer, target in zip(observers[inSight], targets[inSight]):
+        seen[characters[observer]].append(characters[target])
+    return seen
+
+
+def isBlocked(row, col):
+    return tiles.getFlag(row, col, BLOCKER)
+
+
+def paintTile(surface, row, col, x_cords, y_cords):
+    tiles.tile(row, col).paint(surface, x_cords, y_cords)
+
+
+# Blits the pre-rendered chunks around the camera then draws tile contents on top
+def drawMap():
+    MAP_CHUNKS.draw(screen, camera)
+
+    for row, col, x_cords, y_cords in visibleTiles(camera, tiles.rows, tiles.cols,
+                                                   SCREEN_WIDTH, SCREEN_HEIGHT, TILE_SIZE):
+        for content in tiles.getContents(row, col):
+            content.draw(x_cords, y_cords)
+    SPRITE_BATCH.flush(screen)
+
+
+# Everything on the current map and in its characters' inventories leaves the game with it,
+# called before the map is replaced so the registry does not keep them alive
+def releaseWorld():
+    if tiles is None:
+        return
+
+    for obj in list(tiles.index.positions):
+        if isinstance(obj, Character):
+            for item in obj.items:
+                item.release()
+        obj.release()
+
+
+# The map is being replaced, incremental saves must not append it to the file the old one was saved to
+def forgetSave():
+    global SAVED
+
+    if SAVED is not None:
+        SAVED.close()
+        SAVED = None
+
+
+# Builds a map of yRange rows by xRange columns, one screen's worth by default
+def generateTiles(xRange=int(TILES_X), yRange=int(TILES_Y)):
+    global tiles, MAP_CHUNKS, camera
+
+    releaseWorld()
+    forgetSave()
+    MOVEMENT_CACHE.reset()
+    PATH_CACHE.reset()
+    FOV_CACHE.reset()
+    UNSAVED_CHUNKS.clear()
+
+    tiles = Grid(yRange, xRange, TERRAINS, Tile)
+
+    # Road through the middle rows, the map wraps around at its edges
+    for row in range(yRange):
+        if row == yRange / 2 - 1 or row == yRange / 2 or row == yRange / 2 + 1:
+            tiles.fill(DirtRoad, rows=row)
+
+    camera = [int(yRange / 2), int(xRange / 2)]
+    tiles.listeners.append(onTileChanged)
+    MAP_CHUNKS = ChunkCache(tiles, TILE_SIZE, paintTile, CHUNK_SIZE)
+
+
+# Chunk generator for a world with the given number of rows
+def worldGenerator(rows):
+    grass = TERRAINS.index(GrassLand)
+    dirt = TERRAINS.index(DirtRoad)
+
+    # Same road through the middle rows as generateTiles with patches of dirt scattered around
+    def generateChunk(rowStart, colStart, shape, rng):
+        terrain = np.where(rng.random(shape) < DIRT_PATCHES, dirt, grass)
+        for row in range(rows // 2 - 1, rows // 2 + 2):
+            if rowStart <= row < rowStart + shape[0]:
+                terrain[row - rowStart, :] = dirt
+        return terrain
+
+    return generateChunk
+
+
+# Makes world the map and points the camera at camera_row, camera_col
+def useWorld(world, camera_row, camera_col):
+    global tiles, MAP_CHUNKS, camera
+
+    forgetSave()
+    MOVEMENT_CACHE.reset()
+    PATH_CACHE.reset()
+    FOV_CACHE.reset()
+    UNSAVED_CHUNKS.clear()
+
+    tiles = world
+    camera = [camera_row, camera_col]
+    tiles.stream(camera[0], camera[1])
+    tiles.listeners.append(onTileChanged)
+    MAP_CHUNKS = ChunkCache(tiles, TILE_SIZE, paintTile, CHUNK_SIZE)
+
+
+# Builds a world of rows by cols tiles that is generated from seed a chunk at a time as the camera gets near it
+def generateWorld(seed, rows=WORLD_SIZE, cols=WORLD_SIZE):
+    releaseWorld()
+    useWorld(ChunkedWorld(rows, cols, TERRAINS, Tile, worldGenerator(rows), seed, WORLD_CHUNK_SIZE),
+             rows // 2, cols // 2)
+
+
+# Builds the map, the main character and the character buttons.
+# With a seed the map is a generated world instead of a single screen.
+def newGame(seed=None):
+    global MainCharacter
+
+    if seed is None:
+        generateTiles()
+    else:
+        generateWorld(seed)
+    tiles[int(len(tiles) / 2)][int(len(tiles[0]) / 2)].addContent(Tree())
+
+    MainCharacter = Character((camera[0], camera[1] + 1))
+    MainCharacter.get(SunGlasses())
+    MainCharacter.get(SunGlasses())
+
+    tiles[camera[0]][camera[1] + 1].addContent(MainCharacter)
+    DIRTY.addAll()
+
+    createButtons()
+
+
+def createButtons():
+    global ButtonFont
+
+    # Button setup variables
+    ButtonNames = ["Spells", "Items", "Movement", "Retrieve"]
+
+    ButtonCount = len(ButtonNames)
+    ButtonWidth = int(SCREEN_WIDTH / (ButtonCount + 1))
+    ButtonZeroX = int(ButtonWidth / (ButtonCount + 1))
+    ButtonIncX = int(ButtonWidth + ButtonZeroX)
+
+    ButtonY = int(SCREEN_HEIGHT / 8 * 6)
+    ButtonHeight = int(SCREEN_HEIGHT / 8)
+
+    ButtonColor = (45, 45, 90)
+    ButtonTextColor = (0, 230, 100)
+
+    longestWord = 0
+    for x in range(1, ButtonCount):
+        if len(ButtonNames[x]) > len(ButtonNames[longestWord]):
+            longestWord = x
+
+    ButtonFont = fitTextSize(font, (0, 0, ButtonWidth, ButtonHeight), ButtonNames[longestWord] + "XX")
+
+    # Button setup
+    del characterButtons[:]
+    for buttonID in range(ButtonCount):
+        characterButtons.append(Button((ButtonZeroX + buttonID * ButtonIncX, ButtonY, ButtonWidth, ButtonHeight),
+                                       ButtonNames[buttonID], ButtonColor, ButtonTextColor, ButtonFont))
+
+
+SAVE_FILE = ROOT + "/quicksave.qsav"
+# Entity flags
+MAIN_CHARACTER = 1
+# Classes that can be saved by name, Items are rebuilt through Item.__init__ with their saved fields
+SAVED_KINDS = {cls.__name__: cls for cls in (Tree, Character, Item, SunGlasses)}
+
+
+# Builds the entity table: everything on the map, then each character's items in inventory order
+def entityTable():
+    strings = []
+    stringIds = {}
+
+    def string(text):
+        if text not in stringIds:
+            stringIds[text] = len(strings)
+            strings.append(text)
+        return stringIds[text]
+
+    records = []
+
+    def record(obj, row, col, owner, equipped):
+        kind = type(obj).__name__
+        if SAVED_KINDS.get(kind) is not type(obj):
+            raise ValueError("Objects of type %s can not be saved" % kind)
+
+        entity = {"oid": obj.OID, "kind": string(kind), "row": row, "col": col, "owner": owner,
+                  "equipped": equipped, "flags": MAIN_CHARACTER if obj is MainCharacter else 0}
+        if isinstance(obj, Character):
+            entity["movement"] = obj.movement
+        if isinstance(obj, Item):
+            entity.update(name=string(obj.name), type=string(obj.type), action=string(obj.action),
+                          weight=obj.weight, value=obj.value)
+        records.append(entity)
+
+    for obj, (row, col) in tiles.index.positions.items():
+        record(obj, row, col, NO_OWNER, 0)
+        if isinstance(obj, Character):
+            order = {item: count + 1 for count, item in enumerate(obj.items.equippedItems())}
+            for item in obj.items:
+                record(item, -1, -1, obj.OID, order.get(item, 0))
+
+    entities = np.zeros(len(records), dtype=ENTITY_RECORD)
+    for index, entity in enumerate(records):
+        for field, value in entity.items():
+            entities[index][field] = value
+
+    return entities, strings
+
+
+# Numbers are saved as doubles, whole ones come back as ints
+def savedNumber(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def restoreEntity(entity, strings):
+    kind = SAVED_KINDS[strings[entity["kind"]]]
+
+    if issubclass(kind, Character):
+        return kind((int(entity["row"]), int(entity["col"])), savedNumber(entity["movement"]) - BASE_MOVEMENT_COST)
+    if issubclass(kind, Item):
+        item = kind.__new__(kind)
+        Item.__init__(item, strings[entity["type"]], savedNumber(entity["weight"]), savedNumber(entity["value"]),
+                      strings[entity["name"]], strings[entity["action"]])
+        return item
+    return kind()
+
+
+# Saves the map, everything on it and every inventory to file_name.
+# Incremental saves only add the terrain chunks changed since the last save to the file that save went to.
+def saveGame(file_name=SAVE_FILE, incremental=False):
+    global SAVED
+
+    seeded = isinstance(tiles, ChunkedWorld) and \
+        (not isinstance(tiles.generator, SavedTerrain) or tiles.generator.fallback is not None)
+    header = SaveHeader(VERSION, HAS_SEED if seeded else 0, tiles.rows, tiles.cols, WORLD_CHUNK_SIZE,
+                        tiles.seed if seeded else 0, camera[0], camera[1])
+    entities, strings = entityTable()
+
+    # Falls back to a full save, which compacts the file, once earlier appends have left too much behind
+    if incremental and SAVED is not None and SAVED.fileName == file_name and \
+            SAVED.header.chunkSize == WORLD_CHUNK_SIZE and not SAVED.needsCompacting():
+        appendSave(file_name, header, [(key, chunkTerrain(key)) for key in sorted(UNSAVED_CHUNKS)], entities,
+                   strings)
+    else:
+        if not isinstance(tiles, ChunkedWorld):
+            keys = [(row, col) for row in range(-(-tiles.rows // WORLD_CHUNK_SIZE))
+                    for col in range(-(-tiles.cols // WORLD_CHUNK_SIZE))]
+        else:
+            # Generated chunks that were never changed come back from the seed
+            keys = set(tiles.editedChunks())
+            if isinstance(tiles.generator, SavedTerrain):
+                keys.update(tiles.generator.saveFile.offsets.keys())
+            keys = sorted(keys)
+
+        chunks = [(key, chunkTerrain(key)) for key in keys]
+        if SAVED is not None:
+            SAVED.close()
+        writeSave(file_name, header, chunks, entities, strings)
+
+    UNSAVED_CHUNKS.clear()
+    SAVED = SaveFile(file_name)
+    if isinstance(tiles, ChunkedWorld) and isinstance(tiles.generator, SavedTerrain):
+        tiles.generator.saveFile = SAVED
+
+
+def chunkTerrain(key):
+    if isinstance(tiles, ChunkedWorld) and tiles.chunkSize == WORLD_CHUNK_SIZE:
+        return tiles.chunkTerrain(key)
+
+    rows = range(key[0] * WORLD_CHUNK_SIZE, min((key[0] + 1) * WORLD_CHUNK_SIZE, tiles.rows))
+    cols = range(key[1] * WORLD_CHUNK_SIZE, min((key[1] + 1) * WORLD_CHUNK_SIZE, tiles.cols))
+    return tiles.terrain[np.ix_(rows, cols)]
+
+
+# Replaces the current map with the one saved in file_name. The terrain is memory-mapped and chunks are only
+# read once the camera gets near them, the saved OIDs just link items to their owners and new ones are handed out.
+def loadGame(file_name=SAVE_FILE):
+    global MainCharacter, SAVED, LD, state, actor, selected
+
+    saved = SaveFile(file_name)
+    header = saved.header
+    fallback = worldGenerator(header.rows) if header.flags & HAS_SEED else None
+    releaseWorld()
+    useWorld(ChunkedWorld(header.rows, header.cols, TERRAINS, Tile, SavedTerrain(saved, fallback), header.seed,
+                          header.chunkSize), header.cameraRow, header.cameraCol)
+    SAVED = saved
+
+    objects = {}
+    equipped = []
+    MainCharacter = None
+    for entity in saved.entities:
+        obj = restoreEntity(entity, saved.strings)
+        objects[int(entity["oid"])] = obj
+        if entity["flags"] & MAIN_CHARACTER:
+            MainCharacter = obj
+
+        if entity["owner"] == NO_OWNER:
+            tiles.addContent(int(entity["row"]), int(entity["col"]), obj)
+        else:
+            owner = objects[int(entity["owner"])]
+            owner.get(obj)
+            if entity["equipped"] > 0:
+                equipped.append((int(entity["equipped"]), owner, obj))
+
+    for order, owner, item in sorted(equipped, key=lambda entry: entry[0]):
+        owner.equip(item)
+
+    LD = None
+    state = NORMAL
+    actor = None
+    selected = None
+    setCharacterButtons(False)
+    DIRTY.addAll()
+
+
+# Loop constants
+NORMAL = 0
+SELECTING = 1
+MOVING = 2
+GRABBING = 3
+
+# Loop variables
+LD = None
+DEBUGGING = False
+state = NORMAL
+selected = None
+actor = None
+EVENTS = EventDispatcher()
+# How often the frame timings refresh while nothing else is happening, in milliseconds
+OVERLAY_REFRESH = 500
+CAMERA_KEYS = {pygame.K_LEFT: (0, 1), pygame.K_RIGHT: (0, -1), pygame.K_UP: (1, 0), pygame.K_DOWN: (-1, 0)}
+
+
+def moveCamera(d_row, d_col):
+    camera[0] = (camera[0] + d_row) % len(tiles)
+    camera[1] = (camera[1] + d_col) % len(tiles[0])
+    tiles.stream(camera[0], camera[1])
+    DIRTY.addAll()
+
+
+def refreshOverlay():
+    if DEBUGGING:
+        DIRTY.add(OVERLAY_RECT)
+        EVENTS.after(OVERLAY_REFRESH, refreshOverlay)
+
+
+# Mouse buttons in the form Button.handleClick takes them
+def pressedButtons(event):
+    return event.button == 1, event.button == 2, event.button == 3
+
+
+def onQuit(event):
+    ASSET_MANAGER.shutdown()
+    pygame.quit()
+    quit(0)
+
+
+def onKey(event):
+    global DEBUGGING
+
+    if event.key in CAMERA_KEYS:
+        moveCamera(*CAMERA_KEYS[event.key])
+
+    # Quick save adds to the last save when it can, quick load brings it back
+    if event.key == pygame.K_F5:
+        saveGame(incremental=True)
+    if event.key == pygame.K_F9 and os.path.exists(SAVE_FILE):
+        loadGame()
+
+    if event.key == pygame.K_m:
+        DEBUGGING = not DEBUGGING
+        DIRTY.add(OVERLAY_RECT)
+        if DEBUGGING and not EVENTS.isScheduled(refreshOverlay):
+            EVENTS.after(OVERLAY_REFRESH, refreshOverlay)
+
+    # Start recording a frame trace, the second press writes it out
+    if event.key == pygame.K_t:
+        if PROFILER.isTracing():
+            traceFile = "frame_trace_%d.json" % time.time()
+            PROFILER.stopTrace(traceFile)
+            print("Frame trace written to", traceFile)
+        else:
+            PROFILER.startTrace()
+
+    return True
+
+
+# The character buttons take every click while they are up, even ones that miss them
+def clickCharacterButtons(event):
+    global LD, state, actor
+
+    if event.button != 1 or not showCharacterButtons:
+        return False
+
+    for index, button in enumerate(characterButtons):
+        result = button.handleClick(pressedButtons(event), event.pos)
+        if result:
+            if index == 1:
+                LD = ListDisplay(selected.items, txt="Items")
+                state = SELECTING
+            if index == 2:
+                selected.highlight()
+                state = MOVING
+            if index == 3:
+                state = GRABBING
+                actor = selected
+            setCharacterButtons(False)
+
+    return True
+
+
+# An open item list takes every click, a click outside it closes it
+def clickItemList(event):
+    global LD, state, actor
+
+    if event.button != 1 or state != SELECTING:
+        return False
+
+    LD_result = LD.handleMouse(event.pos, pressedButtons(event))
+    if LD_result == 0:
+        actor = None
+        state = NORMAL
+        selected.deselect()
+        LD.markDirty()
+        LD = None
+
+    return True
+
+
+def clickMap(event):
+    global state, actor
+
+    if event.button != 1:
+        return False
+
+    mouseLocation = event.pos
+    tile_x = int(camera[1] - (SCREEN_CENTER_X - HALF_TILE - mouseLocation[0]) / TILE_SIZE)
+    tile_y = int(camera[0] - (SCREEN_CENTER_Y - HALF_TILE - mouseLocation[1]) / TILE_SIZE)
+
+    if tile_y >= len(tiles):
+        tile_y %= len(tiles)
+    if tile_x >= len(tiles[0]):
+        tile_x %= len(tiles[0])
+
+    if DEBUGGING:
+        t = tiles[tile_y][tile_x]
+        print(tile_x, tile_y, t.x, t.y)
+
+    # A move has to be checked first, any other click with a character selected uses an item
+    if selected is not None and type(selected) == Character and state == MOVING:
+        s_tile = tiles[tile_y][tile_x]
+        path = None
+        if s_tile.isHighlighted() and not s_tile.containsBlocker():
+            path = selected.findPathTo((tile_y, tile_x))
+
+        selected.unHighlight()
+        if path is not None:
+            oldRow, oldCol = tiles.locate(selected)
+            tiles.removeContent(oldRow, oldCol, selected)
+            tiles[tile_y][tile_x].addContent(selected)
+            selected.moveTo((tile_y, tile_x), path)
+        selected.deselect()
+
+    elif selected is not None and type(selected) == Character:
+        selected.handleClick(tile_y, tile_x)
+    else:
+        tiles[tile_y][tile_x].toggleSelect()
+
+    if type(selected) == Character:
+        setCharacterButtons(True)
+
+    if state != NORMAL:
+        if state == GRABBING and issubclass(type(selected), Item):
+            actor.pickUp(selected)
+
+        actor = None
+        state = NORMAL
+
+    return True
+
+
+# Uncovered parts of the window have to be drawn again
+def onExpose(event):
+    DIRTY.addAll()
+    return True
+
+
+EVENTS.on(pygame.QUIT, onQuit)
+EVENTS.on(pygame.KEYDOWN, onKey)
+EVENTS.on(pygame.MOUSEBUTTONDOWN, clickCharacterButtons)
+EVENTS.on(pygame.MOUSEBUTTONDOWN, clickItemList)
+EVENTS.on(pygame.MOUSEBUTTONDOWN, clickMap)
+EVENTS.on(pygame.VIDEOEXPOSE, onExpose)
+
+
+# The interactive loop, needs init and newGame first.
+# Sleeps until an event or a scheduled callback comes in and only draws what changed because of it.
+def run():
+    global LD
+
+    while True:
+        events = EVENTS.wait(busy=bool(DIRTY))
+
+        PROFILER.beginFrame()
+        PROFILER.start("input")
+        for event in events:
+            EVENTS.dispatch(event)
+        PROFILER.stop("input")
+
+        if LD is not None and (selected is None or type(selected) != Character):
+            LD.markDirty()
+            LD = None
+
+        # Redraw the map and the UI above it inside each changed region only, then present just those regions
+        if DIRTY:
+            if DEBUGGING:
+                DIRTY.add(OVERLAY_RECT)
+
+            update = DIRTY.take()
+            for rect in update:
+                screen.set_clip(rect)
+                PROFILER.start("map")
+                drawMap()
+                PROFILER.stop("map")
+
+                if LD is not None:
+                    PROFILER.start("list")
+                    LD.draw()
+                    PROFILER.stop("list")
+
+                if showCharacterButtons:
+                    PROFILER.start("buttons")
+                    for index, button in enumerate(characterButtons):
+                        button.draw()
+                    PROFILER.stop("buttons")
+            screen.set_clip(None)
+
+            if DEBUGGING:
+                PROFILER.drawOverlay(screen, FONT_CACHE.get(font, 14), OVERLAY_RECT[:2])
+
+            PROFILER.start("present")
+            pygame.display.update(update)
+            PROFILER.stop("present")
+
+        PROFILER.endFrame()
+
+        # Bursts of input still redraw at most 60 times a second
+        clock.tick(60)
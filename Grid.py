@@ -0,0 +1,145 @@
+import numpy as np
+
+from SpatialIndex import SpatialIndex
+
+
+# Tile flag bits
+HIGHLIGHTED = 1
+SELECTED = 2
+BLOCKER = 4
+
+# Kinds of change reported to listeners
+TERRAIN_CHANGED = 0
+FLAGS_CHANGED = 1
+CONTENTS_CHANGED = 2
+
+
+# Map storage kept in flat NumPy arrays indexed [row, col].
+# Terrain ids index into the terrains list, tiles handed out by grid[row][col] are views built on demand
+# and contents live in a SpatialIndex so objects can be found by position, by type or near a tile.
+class Grid:
+
+    def __init__(self, rows, cols, terrains, tile_type, terrain=0):
+        self.rows = rows
+        self.cols = cols
+        self.terrains = list(terrains)
+        self.tileType = tile_type
+
+        self.terrainCosts = np.array([t.difficulty for t in self.terrains], dtype=np.float32)
+        self.createLayers(terrain)
+
+        self.index = SpatialIndex(rows, cols)
+        self.selectedItems = {}
+        self.listeners = []
+
+    # The terrain, difficulty and flags layers indexed [row, col], whole-map arrays here
+    def createLayers(self, terrain):
+        self.terrain = np.full((self.rows, self.cols), terrain, dtype=np.uint8)
+        self.difficulty = self.terrainCosts[self.terrain]
+        self.flags = np.zeros((self.rows, self.cols), dtype=np.uint8)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        return GridRow(self, row)
+
+    def tile(self, row, col):
+        return self.tileType(self, row % self.rows, col % self.cols)
+
+    # The whole map is always in memory, a ChunkedWorld loads and drops chunks around row, col here
+    def stream(self, row, col):
+        pass
+
+    def changed(self, row, col, kind):
+        for listener in self.listeners:
+            listener(row, col, kind)
+
+    # Terrain
+    def terrainId(self, terrain):
+        return self.terrains.index(terrain)
+
+    def getTerrain(self, row, col):
+        return self.terrains[self.terrain[row, col]]
+
+    def setTerrain(self, row, col, terrain):
+        terrain_id = self.terrainId(terrain)
+        self.terrain[row, col] = terrain_id
+        self.difficulty[row, col] = self.terrainCosts[terrain_id]
+        self.changed(row, col, TERRAIN_CHANGED)
+
+    # Paints a block of rows/columns at once, meant for generation before anything listens
+    def fill(self, terrain, rows=slice(None), cols=slice(None)):
+        terrain_id = self.terrainId(terrain)
+        self.terrain[rows, cols] = terrain_id
+        self.difficulty[rows, cols] = self.terrainCosts[terrain_id]
+
+    # Flags
+    def getFlag(self, row, col, flag):
+        return bool(self.flags[row, col] & flag)
+
+    def setFlag(self, row, col, flag, on):
+        old = int(self.flags[row, col])
+        new = old | flag if on else old & ~flag
+        if new != old:
+            self.flags[row, col] = new
+            self.changed(row, col, FLAGS_CHANGED)
+
+    def withFlag(self, flag):
+        return np.argwhere(self.flags & flag)
+
+    def blockers(self):
+        return (self.flags & BLOCKER) != 0
+
+    # [row, col] of every blocked tile among the given rows and columns, e.g. the ones on screen
+    def blockersIn(self, rows, cols):
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        hits = np.argwhere(self.flags[np.ix_(rows, cols)] & BLOCKER)
+        return np.column_stack((rows[hits[:, 0]], cols[hits[:, 1]]))
+
+    # Contents
+    def getContents(self, row, col):
+        return self.index.at(row, col)
+
+    # Where on the map an object lies, None when it is not on a tile
+    def locate(self, obj):
+        return self.index.locate(obj)
+
+    # (obj, row, col) for everything at most radius tiles from row, col, optionally only instances of kind
+    def within(self, row, col, radius, kind=object):
+        return self.index.within(row, col, radius, kind)
+
+    def addContent(self, row, col, obj):
+        self.index.add(row, col, obj)
+        self.updateBlocker(row, col)
+        self.changed(row, col, CONTENTS_CHANGED)
+
+    def removeContent(self, row, col, obj):
+        if self.index.locate(obj) != (row, col):
+            raise ValueError("%r is not on tile %d, %d" % (obj, row, col))
+        self.index.remove(obj)
+        if len(self.index.at(row, col)) == 0:
+            self.selectedItems.pop((row, col), None)
+        self.updateBlocker(row, col)
+        self.changed(row, col, CONTENTS_CHANGED)
+
+    def updateBlocker(self, row, col):
+        flags = int(self.flags[row, col])
+        if any(content.isBlocking() for content in self.getContents(row, col)):
+            self.flags[row, col] = flags | BLOCKER
+        else:
+            self.flags[row, col] = flags & ~BLOCKER
+
+
+class GridRow:
+
+    def __init__(self, grid, row):
+        self.grid = grid
+        self.row = row
+
+    def __len__(self):
+        return self.grid.cols
+
+    def __getitem__(self, col):
+        return self.grid.tile(self.row, col)
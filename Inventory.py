@@ -0,0 +1,198 @@
+import bisect
+
+# Fields stacks can be sorted and filtered by
+SORT_FIELDS = ("name", "weight", "value")
+
+
+# Items that only differ in their OID stack together
+def stackKey(item):
+    return type(item), item.type, item.name, item.weight, item.value, item.action
+
+
+# Identical items held by one inventory, the real item objects are kept so each can still be equipped or dropped
+# on its own. Equipped items are kept apart from the rest so picking one of either kind is O(1).
+class Stack:
+
+    def __init__(self, key, order, item):
+        self.key = key
+        self.order = order
+        self.name = item.name
+        self.type = item.type
+        self.weight = item.weight
+        self.value = item.value
+
+        # OID -> item
+        self.loose = {}
+        self.worn = {}
+
+    def __len__(self):
+        return len(self.loose) + len(self.worn)
+
+    def __repr__(self):
+        return "Stack(%r x%d)" % (self.name, len(self))
+
+    @property
+    def quantity(self):
+        return len(self)
+
+    @property
+    def equipped(self):
+        return len(self.worn)
+
+    def items(self):
+        return list(self.worn.values()) + list(self.loose.values())
+
+    # Any one item of the stack, an unequipped one unless equipped is set. None when there is none of that kind.
+    def pick(self, equipped=False):
+        items = self.worn if equipped else self.loose
+        if len(items) == 0:
+            return None
+
+        # popitem is O(1) where iterating from the front slows down as items are taken out
+        oid, item = items.popitem()
+        items[oid] = item
+        return item
+
+
+# A character's items, stacked by stackKey and looked up by OID, which stays the same for as long as the item
+# exists. Adding, removing, equipping and unequipping an item are O(1).
+# Stacks sorted by a field are only built the first time they are asked for, after that new and emptied stacks
+# are inserted and removed in place. That is a list insert or delete, so adding the first item of a kind or
+# removing the last one is O(stacks) once a sorted view exists.
+class Inventory:
+
+    def __init__(self, stackKey=stackKey):
+        self.stackKey = stackKey
+
+        # OID -> item, item OID -> its stack, stack key -> stack
+        self.byOID = {}
+        self.stackOf = {}
+        self.stacks = {}
+
+        # OID -> item in the order they were put on
+        self.equipped = {}
+
+        # field -> (sort keys, stacks) in the same order
+        self.sorted = {}
+        self.created = 0
+
+    def __len__(self):
+        return len(self.byOID)
+
+    def __contains__(self, item):
+        return self.byOID.get(item.OID) is item
+
+    def stackCount(self):
+        return len(self.stacks)
+
+    def __iter__(self):
+        return iter(list(self.byOID.values()))
+
+    def get(self, oid):
+        return self.byOID.get(oid)
+
+    def stack(self, item):
+        return self.stackOf[item.OID]
+
+    def isEquipped(self, item):
+        return item.OID in self.equipped
+
+    def equippedItems(self):
+        return self.equipped.values()
+
+    def add(self, item):
+        if item.OID in self.byOID:
+            raise ValueError("%r is already in this inventory" % item)
+
+        key = self.stackKey(item)
+        stack = self.stacks.get(key)
+        if stack is None:
+            stack = Stack(key, self.created, item)
+            self.created += 1
+            self.stacks[key] = stack
+            for field in self.sorted:
+                self.insertSorted(field, stack)
+
+        stack.loose[item.OID] = item
+        self.byOID[item.OID] = item
+        self.stackOf[item.OID] = stack
+        return stack
+
+    # Takes item out, unequipping it first if it was equipped
+    def remove(self, item):
+        if item not in self:
+            raise ValueError("%r is not in this inventory" % item)
+
+        stack = self.stackOf.pop(item.OID)
+        del self.byOID[item.OID]
+        self.equipped.pop(item.OID, None)
+        stack.loose.pop(item.OID, None)
+        stack.worn.pop(item.OID, None)
+
+        if len(stack) == 0:
+            del self.stacks[stack.key]
+            for field in self.sorted:
+                self.removeSorted(field, stack)
+
+        return item
+
+    def equip(self, item):
+        stack = self.stack(item)
+        del stack.loose[item.OID]
+        stack.worn[item.OID] = item
+        self.equipped[item.OID] = item
+
+    def unequip(self, item):
+        stack = self.stack(item)
+        del stack.worn[item.OID]
+        stack.loose[item.OID] = item
+        del self.equipped[item.OID]
+
+    def sortKey(self, field, stack):
+        # order breaks ties so every stack has its own key and can be found again with bisect
+        return getattr(stack, field), stack.order
+
+    def sortedStacks(self, field):
+        if field not in SORT_FIELDS:
+            raise ValueError("Inventories can not be sorted by %r" % field)
+
+        if field not in self.sorted:
+            stacks = sorted(self.stacks.values(), key=lambda stack: self.sortKey(field, stack))
+            self.sorted[field] = ([self.sortKey(field, stack) for stack in stacks], stacks)
+        return self.sorted[field]
+
+    def insertSorted(self, field, stack):
+        keys, stacks = self.sorted[field]
+        key = self.sortKey(field, stack)
+        index = bisect.bisect_left(keys, key)
+        keys.insert(index, key)
+        stacks.insert(index, stack)
+
+    def removeSorted(self, field, stack):
+        keys, stacks = self.sorted[field]
+        index = bisect.bisect_left(keys, self.sortKey(field, stack))
+        del keys[index]
+        del stacks[index]
+
+    # Stacks sorted by field from start up to stop, a page of a list display only copies the stacks on it
+    def sortedBy(self, field, start=0, stop=None, reverse=False):
+        stacks = self.sortedStacks(field)[1]
+        if not reverse:
+            return stacks[start:stop]
+
+        count = len(stacks)
+        start = min(start, count)
+        stop = count if stop is None else max(start, min(stop, count))
+        return stacks[count - stop:count - start][::-1]
+
+    # Stacks with low <= field <= high in order, either end can be left open with None
+    def within(self, field, low=None, high=None):
+        keys, stacks = self.sortedStacks(field)
+        start = 0 if low is None else bisect.bisect_left(keys, (low,))
+        stop = len(keys) if high is None else bisect.bisect_left(keys, (high, self.created))
+        return stacks[start:stop]
+
+    # Stacks whose name starts with prefix, by name
+    def named(self, prefix):
+        keys, stacks = self.sortedStacks("name")
+        return stacks[bisect.bisect_left(keys, (prefix,)):bisect.bisect_left(keys, (prefix + "\uffff",))]
@@ -0,0 +1,310 @@
+import collections
+import heapq
+import itertools
+
+import numpy as np
+
+
+# Finds every tile reachable from (x, y) with a movement budget.
+# Entering a tile (the starting one included) costs difficulty * baseCost and the map wraps at its edges.
+# difficulty is the [row, col] array of a Grid, x and y index it in that order.
+# Returns a list of (x, y, remaining movement) holding each reachable tile exactly once.
+def findReachable(difficulty, x, y, movement, baseCost):
+    width, height = difficulty.shape
+    x %= width
+    y %= height
+
+    using = float(difficulty[x, y]) * baseCost
+    if using > movement:
+        return []
+
+    # heapq is a min-heap so remaining movement is stored negated to expand the best tile first
+    best = {(x, y): movement - using}
+    queue = [(using - movement, x, y)]
+    done = set()
+    reachable = []
+
+    while queue:
+        negRemaining, cx, cy = heapq.heappop(queue)
+        if (cx, cy) in done:
+            continue
+        done.add((cx, cy))
+
+        remaining = -negRemaining
+        reachable.append((cx, cy, remaining))
+
+        for nx, ny in (((cx - 1) % width, cy), ((cx + 1) % width, cy),
+                       (cx, (cy - 1) % height), (cx, (cy + 1) % height)):
+            if (nx, ny) in done:
+                continue
+
+            left = remaining - float(difficulty[nx, ny]) * baseCost
+            if left < 0 or best.get((nx, ny), -1) >= left:
+                continue
+
+            best[(nx, ny)] = left
+            heapq.heappush(queue, (-left, nx, ny))
+
+    return reachable
+
+
+# Running sums of cost along axis from the start and from the end of each line, the line is doubled with wrap
+def runningCosts(cost, axis, wrap):
+    if wrap:
+        cost = np.concatenate((cost, cost), axis)
+    return np.cumsum(cost, axis), np.flip(np.cumsum(np.flip(cost, axis), axis), axis)
+
+
+# Cheapest way to reach every tile moving straight along axis in either direction from a tile already reached.
+# Going from i to a later j costs cost[i + 1] + ... + cost[j] which is forward[j] - forward[i], so the cheapest
+# arrival at j is forward[j] + the smallest spent[i] - forward[i] with i up to j. Going the other way works the
+# same with the sums from the end. With wrap the line is doubled so paths can go around the map.
+def sweep(spent, axis, forward, backward, wrap):
+    length = spent.shape[axis]
+    if wrap:
+        spent = np.concatenate((spent, spent), axis)
+
+    best = forward + np.minimum.accumulate(spent - forward, axis)
+    np.minimum(best, backward + np.flip(np.minimum.accumulate(np.flip(spent - backward, axis), axis), axis), out=best)
+
+    if wrap:
+        best = np.minimum(np.take(best, np.arange(length), axis), np.take(best, np.arange(length, 2 * length), axis))
+    return best
+
+
+# findReachable for many characters in one go by relaxing every movement range at once with NumPy.
+# starts holds (x, y, movement) per character. Each range is worked out in a window of the map around its start
+# that is just big enough for the furthest any character can get, the cheapest terrain (minDifficulty) sets that
+# size. Without it or when the window would not be smaller than the map the whole map is used.
+# Returns (masks, remaining, origins): masks[i] marks the tiles character i can reach, remaining[i] holds the
+# movement left on each tile (negative when out of reach) and origins[i] is the map tile at [0, 0] of both.
+# Window tiles past the map edge wrap around to the other side.
+def findReachableMany(difficulty, starts, baseCost, minDifficulty=0):
+    rows, cols = difficulty.shape
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    count = len(starts)
+    x = starts[:, 0].astype(np.int64) % rows
+    y = starts[:, 1].astype(np.int64) % cols
+    movement = starts[:, 2]
+
+    # Every tile entered, the first one included, costs at least minDifficulty * baseCost
+    steps = -1
+    if minDifficulty > 0 and count > 0:
+        steps = int(movement.max() // (minDifficulty * baseCost)) - 1
+
+    wrap = not (0 <= steps and 2 * steps + 1 < rows and 2 * steps + 1 < cols)
+    if not wrap:
+        # Each window gets a ring of tiles no budget can pay for so nothing leaves it. They cost just more than
+        # any budget rather than infinity to keep the running sums the sweeps use finite
+        offsets = np.arange(2 * steps + 3) - steps - 1
+        rowIndex = (x[:, None] + offsets) % rows
+        colIndex = (y[:, None] + offsets) % cols
+        cost = np.asarray(difficulty[rowIndex[:, :, None], colIndex[:, None, :]], dtype=np.float64) * baseCost
+        cost[:, [0, -1], :] = movement.max() + 1
+        cost[:, :, [0, -1]] = movement.max() + 1
+
+        startRow = np.full(count, steps + 1)
+        startCol = np.full(count, steps + 1)
+        origins = np.stack((rowIndex[:, 0], colIndex[:, 0]), axis=1)
+    else:
+        whole = np.asarray(difficulty[np.arange(rows)[:, None], np.arange(cols)[None, :]], dtype=np.float64)
+        cost = np.repeat(whole[None] * baseCost, count, axis=0)
+
+        startRow = x
+        startCol = y
+        origins = np.zeros((count, 2), dtype=np.int64)
+
+    characters = np.arange(count)
+    budget = movement[:, None, None]
+    spent = np.full(cost.shape, np.inf)
+    spent[characters, startRow, startCol] = cost[characters, startRow, startCol]
+    spent[spent > budget] = np.inf
+
+    # Sweep along the rows then the columns until no tile gets any cheaper to reach, every pass lets paths take
+    # one more turn. Ranges that stopped changing are left out of later passes
+    rowSums = runningCosts(cost, 2, wrap)
+    colSums = runningCosts(cost, 1, wrap)
+    active = characters
+    while len(active) > 0:
+        current = spent[active]
+        relaxed = sweep(current, 2, rowSums[0][active], rowSums[1][active], wrap)
+        relaxed = sweep(relaxed, 1, colSums[0][active], colSums[1][active], wrap)
+        relaxed[relaxed > budget[active]] = np.inf
+        # Running sums can be off in the last bits, only real improvements count so the loop always ends
+        relaxed = np.where(relaxed < current - 1e-9, relaxed, current)
+
+        changed = (relaxed != current).any(axis=(1, 2))
+        spent[active] = relaxed
+        active = active[changed]
+
+    remaining = budget - spent
+    return remaining >= 0, remaining, origins
+
+
+# Remembers findReachable results keyed by (x, y, movement, terrain version).
+# Every tile in a cached result points back at the entries it appears in so a change to one tile
+# only drops the ranges that could have passed through it.
+class MovementCache:
+
+    def __init__(self):
+        self.version = 0
+        self.entries = {}
+        self.byTile = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, difficulty, x, y, movement, baseCost):
+        key = (x % difficulty.shape[0], y % difficulty.shape[1], movement, self.version)
+
+        result = self.entries.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = findReachable(difficulty, x, y, movement, baseCost)
+        self.entries[key] = result
+        for p in result:
+            self.byTile.setdefault((p[0], p[1]), set()).add(key)
+
+        return result
+
+    # Drops every range that contains the tile at (x, y)
+    def invalidate(self, x, y):
+        keys = self.byTile.pop((x, y), None)
+        if keys is None:
+            return
+
+        for key in keys:
+            for p in self.entries.pop(key):
+                if (p[0], p[1]) != (x, y):
+                    self.byTile[(p[0], p[1])].discard(key)
+
+    # Called when the whole map is rebuilt, old entries can never match again
+    def reset(self):
+        self.version += 1
+        self.entries = {}
+        self.byTile = {}
+
+
+# Cheapest route from start to goal with A*, moving to the four neighbours and wrapping at the map edges.
+# Like findReachable entering a tile (the starting one included) costs difficulty * baseCost, blocked(x, y) says
+# whether a tile can not be entered and the start tile is never checked since whoever moves stands on it.
+# minDifficulty is the cheapest terrain there is, it makes the distance estimate and with 0 the search is Dijkstra.
+# Routes costing more than maxCost are not followed. Every tile the search looked at is added to touched when given.
+# Returns (list of (x, y) from start to goal, cost) or (None, None) when there is no route.
+def findPath(difficulty, blocked, start, goal, baseCost, minDifficulty=0, maxCost=None, touched=None):
+    width, height = difficulty.shape
+    sx, sy = start[0] % width, start[1] % height
+    gx, gy = goal[0] % width, goal[1] % height
+    stepCost = minDifficulty * baseCost
+    if touched is None:
+        touched = set()
+
+    def estimate(x, y):
+        dx = abs(x - gx)
+        dy = abs(y - gy)
+        return (min(dx, width - dx) + min(dy, height - dy)) * stepCost
+
+    touched.add((sx, sy))
+    spent = {(sx, sy): float(difficulty[sx, sy]) * baseCost}
+    if maxCost is not None and spent[(sx, sy)] > maxCost:
+        return None, None
+
+    # The counter keeps equal estimates in the order they were found instead of comparing positions
+    order = itertools.count()
+    cameFrom = {(sx, sy): None}
+    queue = [(spent[(sx, sy)] + estimate(sx, sy), next(order), sx, sy)]
+    done = set()
+
+    while queue:
+        _, _, x, y = heapq.heappop(queue)
+        if (x, y) in done:
+            continue
+
+        if (x, y) == (gx, gy):
+            path = [(x, y)]
+            while cameFrom[path[-1]] is not None:
+                path.append(cameFrom[path[-1]])
+            path.reverse()
+            return path, spent[(x, y)]
+
+        done.add((x, y))
+        cost = spent[(x, y)]
+
+        for nx, ny in (((x - 1) % width, y), ((x + 1) % width, y), (x, (y - 1) % height), (x, (y + 1) % height)):
+            if (nx, ny) in done:
+                continue
+
+            touched.add((nx, ny))
+            if blocked(nx, ny):
+                continue
+
+            reached = cost + float(difficulty[nx, ny]) * baseCost
+            if maxCost is not None and reached > maxCost:
+                continue
+            if reached >= spent.get((nx, ny), float("inf")):
+                continue
+
+            spent[(nx, ny)] = reached
+            cameFrom[(nx, ny)] = (x, y)
+            heapq.heappush(queue, (reached + estimate(nx, ny), next(order), nx, ny))
+
+    return None, None
+
+
+# Least recently used findPath results keyed by (start, goal, maxCost), routes that were not found included.
+# As in MovementCache every tile a search looked at points back at its entry, a change to a tile only drops the
+# searches it could have changed. Tiles the search never looked at can not make a route any cheaper.
+class PathCache:
+
+    def __init__(self, maxSize=256):
+        self.maxSize = maxSize
+        self.entries = collections.OrderedDict()
+        self.byTile = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, difficulty, blocked, start, goal, baseCost, minDifficulty=0, maxCost=None):
+        width, height = difficulty.shape
+        key = ((start[0] % width, start[1] % height), (goal[0] % width, goal[1] % height), maxCost)
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        touched = set()
+        result = findPath(difficulty, blocked, start, goal, baseCost, minDifficulty, maxCost, touched)
+        self.entries[key] = (result, touched)
+        for tile in touched:
+            self.byTile.setdefault(tile, set()).add(key)
+
+        if len(self.entries) > self.maxSize:
+            self.drop(next(iter(self.entries)))
+
+        return result
+
+    def drop(self, key):
+        result, touched = self.entries.pop(key)
+        for tile in touched:
+            keys = self.byTile.get(tile)
+            if keys is not None:
+                keys.discard(key)
+                if len(keys) == 0:
+                    del self.byTile[tile]
+
+    # Drops every search that looked at the tile at (x, y)
+    def invalidate(self, x, y):
+        for key in self.byTile.pop((x, y), ()):
+            self.drop(key)
+
+    # Called when the whole map is rebuilt
+    def reset(self):
+        self.entries = collections.OrderedDict()
+        self.byTile = {}
@@ -0,0 +1,93 @@
+import collections
+import json
+import time
+
+
+# Times the phases of every frame.
+# start/stop may run several times per frame (once per dirty rect for example), a phase's time is summed per frame.
+# The last window frames are kept for percentiles and while tracing every phase is also kept as a trace event
+# that chrome://tracing or Perfetto can open. Only the last traceLimit events are kept so a forgotten trace
+# can not grow without bound.
+class FrameProfiler:
+
+    def __init__(self, window=240, traceLimit=200000):
+        self.window = window
+        self.traceLimit = traceLimit
+        self.samples = collections.OrderedDict()
+        self.current = {}
+        self.started = {}
+        self.frameStart = None
+        self.trace = None
+
+    def beginFrame(self):
+        self.frameStart = time.perf_counter()
+        self.current = {}
+
+    def start(self, phase):
+        self.started[phase] = time.perf_counter()
+
+    def stop(self, phase):
+        now = time.perf_counter()
+        began = self.started.pop(phase)
+        self.current[phase] = self.current.get(phase, 0) + (now - began) * 1000
+
+        if self.trace is not None:
+            self.trace.append({"name": phase, "ph": "X", "ts": began * 1e6, "dur": (now - began) * 1e6,
+                               "pid": 0, "tid": 0})
+
+    def endFrame(self):
+        now = time.perf_counter()
+        self.current["frame"] = (now - self.frameStart) * 1000
+
+        if self.trace is not None:
+            self.trace.append({"name": "frame", "ph": "X", "ts": self.frameStart * 1e6,
+                               "dur": (now - self.frameStart) * 1e6, "pid": 0, "tid": 1})
+
+        # Phases that did not run this frame count as zero so percentiles stay per frame
+        for phase in self.samples:
+            self.samples[phase].append(self.current.get(phase, 0))
+        for phase in self.current:
+            if phase not in self.samples:
+                self.samples[phase] = collections.deque([self.current[phase]], maxlen=self.window)
+
+    def percentile(self, phase, percent):
+        values = sorted(self.samples.get(phase, ()))
+        if len(values) == 0:
+            return 0
+        return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+    # phase -> (p50, p95, p99, max) in milliseconds over the window
+    def summary(self):
+        stats = collections.OrderedDict()
+        for phase, values in self.samples.items():
+            ordered = sorted(values)
+            stats[phase] = tuple(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in (50, 95, 99)) \
+                + (ordered[-1],)
+        return stats
+
+    def isTracing(self):
+        return self.trace is not None
+
+    def startTrace(self):
+        self.trace = collections.deque(maxlen=self.traceLimit)
+
+    # Writes the recorded events to file_name and stops tracing
+    def stopTrace(self, file_name):
+        with open(file_name, "w") as file:
+            json.dump({"traceEvents": list(self.trace), "displayTimeUnit": "ms"}, file)
+        self.trace = None
+
+    def drawOverlay(self, surface, font, pos, color=(255, 255, 255), background=(0, 0, 0)):
+        lines = ["%-8s %6s %6s %6s %6s" % ("ms", "p50", "p95", "p99", "max")]
+        for phase, stats in self.summary().items():
+            lines.append("%-8s %6.2f %6.2f %6.2f %6.2f" % ((phase,) + stats))
+        if self.trace is not None:
+            lines.append("tracing %d events" % len(self.trace))
+
+        height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines)
+        surface.fill(background, (pos[0], pos[1], width, height * len(lines)))
+        for index, line in enumerate(lines):
+            surface.blit(font.render(line, True, color), (pos[0], pos[1] + index * height))
+
+        return width, height * len(lines)
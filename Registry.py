@@ -0,0 +1,50 @@
+# Object ids are a slot index in the low bits and the slot's generation above it.
+# Releasing an id bumps its slot's generation so the slot can be reused without stale ids finding the new owner.
+INDEX_BITS = 24
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+
+# Hands out object ids in O(1) and maps them back to their objects
+class Registry:
+
+    def __init__(self):
+        self.objects = []
+        self.generations = []
+        self.free = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, oid):
+        return self.get(oid) is not None
+
+    def add(self, obj):
+        if len(self.free) > 0:
+            index = self.free.pop()
+        else:
+            index = len(self.objects)
+            if index > INDEX_MASK:
+                raise OverflowError("Registry is full")
+            self.objects.append(None)
+            self.generations.append(0)
+
+        self.objects[index] = obj
+        self.count += 1
+        return self.generations[index] << INDEX_BITS | index
+
+    def get(self, oid):
+        index = oid & INDEX_MASK
+        if index < len(self.objects) and self.generations[index] == oid >> INDEX_BITS:
+            return self.objects[index]
+        return None
+
+    def remove(self, oid):
+        index = oid & INDEX_MASK
+        if self.get(oid) is None:
+            raise KeyError(oid)
+
+        self.objects[index] = None
+        self.generations[index] += 1
+        self.free.append(index)
+        self.count -= 1
@@ -0,0 +1,185 @@
+import collections
+import os
+import struct
+
+import numpy as np
+
+
+# Layout of a save file, everything little endian:
+#   header             HEADER, offsets below point into the file
+#   chunk data         raw uint8 terrain ids of each saved chunk, row major, anywhere after the header
+#   chunk table        CHUNK_RECORD per saved chunk
+#   entity table       uint32 count, ENTITY_RECORD per entity, then the string table
+# Incremental saves append the changed chunks and new tables after the end of the file and rewrite the header
+# last, so an interrupted save still leaves the previous one readable. A full save writes a compact new file.
+# The header records how many bytes the current tables and chunks take up, everything else was left behind by
+# earlier incremental saves.
+MAGIC = b"QSAV"
+VERSION = 1
+
+# Once the bytes left behind exceed the live ones by this ratio the next save rewrites the file
+COMPACT_RATIO = 1.0
+
+# Header flags
+HAS_SEED = 1
+
+SaveHeader = collections.namedtuple("SaveHeader", ["version", "flags", "rows", "cols", "chunkSize", "seed",
+                                                   "cameraRow", "cameraCol"])
+
+# magic, then the SaveHeader fields, then chunk table offset, chunk count, entity table offset and length, live size
+HEADER = struct.Struct("<4sHHIIIqiiQIQQQ")
+
+CHUNK_RECORD = np.dtype([("row", "<u4"), ("col", "<u4"), ("offset", "<u8")])
+
+# Owner of entities that lie on the map instead of in an inventory
+NO_OWNER = 0xFFFFFFFF
+
+# Strings (names, item types, actions) are stored once in the string table and referenced by index.
+# row and col are -1 for entities in an inventory, equipped is the position in the owner's equipped list plus one.
+ENTITY_RECORD = np.dtype([("oid", "<u4"), ("kind", "<u4"), ("row", "<i4"), ("col", "<i4"), ("owner", "<u4"),
+                          ("equipped", "<u4"), ("flags", "<u4"), ("movement", "<f8"), ("name", "<u4"),
+                          ("type", "<u4"), ("action", "<u4"), ("weight", "<f8"), ("value", "<f8")])
+
+
+def packStrings(strings):
+    encoded = [text.encode("utf-8") for text in strings]
+    lengths = np.array([len(text) for text in encoded], dtype="<u4")
+    return struct.pack("<I", len(encoded)) + lengths.tobytes() + b"".join(encoded)
+
+
+def chunkShape(header, key):
+    return (min(header.chunkSize, header.rows - key[0] * header.chunkSize),
+            min(header.chunkSize, header.cols - key[1] * header.chunkSize))
+
+
+def unpackStrings(data):
+    count = struct.unpack_from("<I", data)[0]
+    lengths = np.frombuffer(data, dtype="<u4", count=count, offset=4)
+
+    strings = []
+    position = 4 + 4 * count
+    for length in lengths:
+        strings.append(data[position:position + length].decode("utf-8"))
+        position += int(length)
+    return strings
+
+
+# An opened save. The header and tables are read straight away, chunk data is memory-mapped and only copied
+# out when a chunk is asked for.
+class SaveFile:
+
+    def __init__(self, file_name):
+        self.fileName = file_name
+
+        with open(file_name, "rb") as file:
+            fields = HEADER.unpack(file.read(HEADER.size))
+            if fields[0] != MAGIC:
+                raise ValueError("%s is not a save file" % file_name)
+            if fields[1] > VERSION:
+                raise ValueError("%s was saved by a newer version (%d)" % (file_name, fields[1]))
+
+            self.header = SaveHeader(*fields[1:9])
+            tableOffset, chunkCount, entityOffset, entityLength, self.liveSize = fields[9:]
+            self.size = file.seek(0, os.SEEK_END)
+
+            file.seek(tableOffset)
+            table = np.frombuffer(file.read(chunkCount * CHUNK_RECORD.itemsize), dtype=CHUNK_RECORD)
+
+            file.seek(entityOffset)
+            entityData = file.read(entityLength)
+
+        self.offsets = {(int(record["row"]), int(record["col"])): int(record["offset"]) for record in table}
+
+        entityCount = struct.unpack_from("<I", entityData)[0]
+        self.entities = np.frombuffer(entityData, dtype=ENTITY_RECORD, count=entityCount, offset=4)
+        self.strings = unpackStrings(entityData[4 + entityCount * ENTITY_RECORD.itemsize:])
+
+        self.data = np.memmap(file_name, dtype=np.uint8, mode="r")
+
+    def __contains__(self, key):
+        return key in self.offsets
+
+    def chunkShape(self, key):
+        return chunkShape(self.header, key)
+
+    # Whether appending to this file would pile more on top of too many bytes nothing points at any more
+    def needsCompacting(self):
+        return self.size - self.liveSize > COMPACT_RATIO * self.liveSize
+
+    def readChunk(self, key):
+        shape = self.chunkShape(key)
+        offset = self.offsets[key]
+        return np.array(self.data[offset:offset + shape[0] * shape[1]]).reshape(shape)
+
+    # Drops the memory map, needed before the file can be replaced on some platforms
+    def close(self):
+        self.data = None
+
+
+# Chunk generator for a ChunkedWorld loaded from a save: saved chunks come from the file, any other chunk
+# from fallback (the seeded generator the world was made with)
+class SavedTerrain:
+
+    def __init__(self, save_file, fallback=None):
+        self.saveFile = save_file
+        self.fallback = fallback
+
+    def __call__(self, row_start, col_start, shape, rng):
+        key = (row_start // self.saveFile.header.chunkSize, col_start // self.saveFile.header.chunkSize)
+        if key in self.saveFile:
+            return self.saveFile.readChunk(key)
+        if self.fallback is None:
+            raise KeyError("Chunk %d, %d is missing from %s" % (key[0], key[1], self.saveFile.fileName))
+        return self.fallback(row_start, col_start, shape, rng)
+
+
+def writeChunks(file, chunks, offsets):
+    for key, terrain in chunks:
+        offsets[key] = file.tell()
+        file.write(np.ascontiguousarray(terrain, dtype=np.uint8).tobytes())
+
+
+def writeTables(file, header, offsets, entities, strings):
+    table = np.zeros(len(offsets), dtype=CHUNK_RECORD)
+    for index, (key, offset) in enumerate(sorted(offsets.items())):
+        table[index] = (key[0], key[1], offset)
+
+    tableOffset = file.tell()
+    file.write(table.tobytes())
+
+    entityOffset = file.tell()
+    file.write(struct.pack("<I", len(entities)))
+    file.write(np.ascontiguousarray(entities, dtype=ENTITY_RECORD).tobytes())
+    file.write(packStrings(strings))
+    entityLength = file.tell() - entityOffset
+
+    liveSize = HEADER.size + table.nbytes + entityLength
+    for key in offsets:
+        shape = chunkShape(header, key)
+        liveSize += shape[0] * shape[1]
+
+    file.flush()
+    file.seek(0)
+    file.write(HEADER.pack(MAGIC, *(header + (tableOffset, len(table), entityOffset, entityLength, liveSize))))
+
+
+# Writes a whole new save. chunks is an iterable of (chunk key, terrain ids), the file is only swapped in once
+# it is complete.
+def writeSave(file_name, header, chunks, entities, strings):
+    temp = file_name + ".tmp"
+    with open(temp, "wb") as file:
+        file.write(bytes(HEADER.size))
+        offsets = {}
+        writeChunks(file, chunks, offsets)
+        writeTables(file, header, offsets, entities, strings)
+    os.replace(temp, file_name)
+
+
+# Adds only the given chunks to an existing save, every other chunk keeps pointing at its old data.
+# The entity table is small and always written whole.
+def appendSave(file_name, header, chunks, entities, strings):
+    offsets = dict(SaveFile(file_name).offsets)
+    with open(file_name, "r+b") as file:
+        file.seek(0, os.SEEK_END)
+        writeChunks(file, chunks, offsets)
+        writeTables(file, header, offsets, entities, strings)
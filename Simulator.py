@@ -0,0 +1,158 @@
+# Headless Monte Carlo runs of item actions, for balancing items without clicking through the UI.
+# An encounter uses every action once per round, the way Character.handleClick uses every equipped item.
+# Usage: python Simulator.py [--encounters N] [--rounds N] [--workers N] [--seed N] ACTION [ACTION ...]
+#   Example: python Simulator.py --encounters 1000000 H-1d10-False D-2d6-psychic-False
+import argparse
+import collections
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Effects import DAMAGE_TYPES, DamageEffect, HealEffect, parseAction
+
+HEAL = "heal"
+TEMPORARY_HEAL = "temporary heal"
+
+# Encounters per batch, every batch draws from its own random stream so results only depend on the seed
+BATCH_SIZE = 100000
+
+Summary = collections.namedtuple("Summary", ["encounters", "mean", "std", "min", "p5", "median", "p95", "max"])
+
+
+# Exact distribution of an integer total as counts of every value from low up
+class Distribution:
+
+    def __init__(self, low, counts):
+        self.low = low
+        self.counts = counts
+
+    @classmethod
+    def of(cls, totals, low, high):
+        return cls(low, np.bincount(totals - low, minlength=high - low + 1).astype(np.int64))
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    def values(self):
+        return np.arange(self.low, self.low + len(self.counts))
+
+    def total(self):
+        return int(self.counts.sum())
+
+    def mean(self):
+        return float((self.values() * self.counts).sum() / self.total())
+
+    def std(self):
+        mean = self.mean()
+        return float(np.sqrt((((self.values() - mean) ** 2) * self.counts).sum() / self.total()))
+
+    # Smallest value at least fraction of the encounters came in at or under
+    def percentile(self, fraction):
+        cumulative = np.cumsum(self.counts)
+        return int(self.low + np.searchsorted(cumulative, fraction * cumulative[-1]))
+
+    def summary(self):
+        seen = np.nonzero(self.counts)[0]
+        return Summary(self.total(), self.mean(), self.std(), int(self.low + seen[0]), self.percentile(0.05),
+                       self.percentile(0.5), self.percentile(0.95), int(self.low + seen[-1]))
+
+
+# Category an effect's amount is counted under, None for effects without an amount (spells)
+def category(effect):
+    if isinstance(effect, DamageEffect):
+        for name, damageType in DAMAGE_TYPES.items():
+            if damageType == effect.damageType:
+                return name
+    if isinstance(effect, HealEffect):
+        return TEMPORARY_HEAL if effect.temporary else HEAL
+    return None
+
+
+# Lowest and highest total one roll can give
+def bounds(dice):
+    return (dice.constant + sum(count for count, sides in dice.dice),
+            dice.constant + sum(count * sides for count, sides in dice.dice))
+
+
+# category -> dice of every action counted under it, effects in the same category are added together
+def plan(actions):
+    grouped = {}
+    for action in actions:
+        effect = parseAction(action)
+        name = category(effect) if effect is not None else None
+        if name is not None:
+            grouped.setdefault(name, []).append(effect.dice)
+    return grouped
+
+
+# Runs one batch with its own random stream, category -> Distribution
+def simulateBatch(actions, rounds, encounters, seedSequence):
+    rng = np.random.default_rng(seedSequence)
+
+    distributions = {}
+    for name, allDice in plan(actions).items():
+        totals = np.zeros(encounters, dtype=np.int64)
+        low = high = 0
+        for dice in allDice:
+            totals += dice.rollMany(encounters * rounds, rng).reshape(encounters, rounds).sum(axis=1)
+            rollLow, rollHigh = bounds(dice)
+            low += rollLow * rounds
+            high += rollHigh * rounds
+        distributions[name] = Distribution.of(totals, low, high)
+
+    return distributions
+
+
+# Simulates encounters of the given actions and returns category -> Summary.
+# Batches run on a process pool of workers processes (all cores by default), or in this process with workers=1.
+# The same seed gives the same result whatever the number of workers.
+def simulate(actions, encounters, rounds=1, seed=None, workers=None, batchSize=BATCH_SIZE):
+    actions = list(actions)
+    plan(actions)  # Bad actions fail here rather than in a worker
+
+    sizes = [batchSize] * (encounters // batchSize)
+    if encounters % batchSize:
+        sizes.append(encounters % batchSize)
+    streams = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(sizes) <= 1:
+        batches = [simulateBatch(actions, rounds, size, stream) for size, stream in zip(sizes, streams)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+            batches = list(pool.map(simulateBatch, [actions] * len(sizes), [rounds] * len(sizes), sizes, streams))
+
+    merged = {}
+    for batch in batches:
+        for name, distribution in batch.items():
+            if name in merged:
+                merged[name].merge(distribution)
+            else:
+                merged[name] = distribution
+
+    return {name: distribution.summary() for name, distribution in merged.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo runs of item actions")
+    parser.add_argument("actions", nargs="+", help="item action strings, see Effects.py")
+    parser.add_argument("--encounters", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=1, help="times every action is used per encounter")
+    parser.add_argument("--workers", type=int, help="processes to run on, all cores by default")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    results = simulate(args.actions, args.encounters, args.rounds, args.seed, args.workers)
+
+    print("%-16s %10s %8s %6s %6s %6s %6s %6s" % ("", "mean", "std", "min", "p5", "median", "p95", "max"))
+    for name, result in sorted(results.items()):
+        print("%-16s %10.3f %8.3f %6d %6d %6d %6d %6d" % (name, result.mean, result.std, result.min, result.p5,
+                                                          result.median, result.p95, result.max))
+
+
+if __name__ == "__main__":
+    main()
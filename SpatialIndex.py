@@ -0,0 +1,96 @@
+# Where every object on the map is, looked up either way: position -> objects and object -> position.
+# Objects are also grouped by their class so "all items near here" does not have to walk every cell.
+# rows and cols wrap the same way the map does.
+class SpatialIndex:
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+
+        # Only cells that hold something have a list
+        self.cells = {}
+        self.positions = {}
+        self.byType = {}
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, obj):
+        return obj in self.positions
+
+    def at(self, row, col):
+        return self.cells.get((row, col), [])
+
+    def locate(self, obj):
+        return self.positions.get(obj)
+
+    def add(self, row, col, obj):
+        self.cells.setdefault((row, col), []).append(obj)
+        self.positions[obj] = (row, col)
+        self.byType.setdefault(type(obj), {})[obj] = (row, col)
+
+    def remove(self, obj):
+        row, col = self.positions.pop(obj)
+        cell = self.cells[(row, col)]
+        cell.remove(obj)
+        if len(cell) == 0:
+            del self.cells[(row, col)]
+
+        objects = self.byType[type(obj)]
+        del objects[obj]
+        if len(objects) == 0:
+            del self.byType[type(obj)]
+
+        return row, col
+
+    # obj -> position for every object that is an instance of kind, subclasses included
+    def ofType(self, kind):
+        found = {}
+        for cls, objects in self.byType.items():
+            if issubclass(cls, kind):
+                found.update(objects)
+        return found
+
+    # Steps between two cells along each axis going whichever way around the map is shorter
+    def distance(self, row, col, other_row, other_col):
+        dRow = abs(row - other_row) % self.rows
+        dCol = abs(col - other_col) % self.cols
+        return max(min(dRow, self.rows - dRow), min(dCol, self.cols - dCol))
+
+    # (obj, row, col) for every object at most radius tiles away in both directions, optionally only instances of kind.
+    # Walks the square around the cell when that is smaller than the candidates, otherwise checks each candidate.
+    def within(self, row, col, radius, kind=object):
+        candidates = self.ofType(kind) if kind is not object else self.positions
+        side = 2 * radius + 1
+
+        if side * side < len(candidates):
+            found = []
+            for dRow in range(-radius, radius + 1) if side < self.rows else range(self.rows):
+                for dCol in range(-radius, radius + 1) if side < self.cols else range(self.cols):
+                    cellRow = (row + dRow) % self.rows
+                    cellCol = (col + dCol) % self.cols
+                    for obj in self.cells.get((cellRow, cellCol), ()):
+                        if obj in candidates:
+                            found.append((obj, cellRow, cellCol))
+            return found
+
+        return [(obj, position[0], position[1]) for obj, position in candidates.items()
+                if self.distance(row, col, position[0], position[1]) <= radius]
+
+    # (obj, row, col) for every object inside the given row and column indices, e.g. the ones on screen
+    def inRegion(self, rows, cols, kind=object):
+        rows = set(rows)
+        cols = set(cols)
+        candidates = self.ofType(kind) if kind is not object else self.positions
+
+        if len(rows) * len(cols) < len(candidates):
+            found = []
+            for cellRow in rows:
+                for cellCol in cols:
+                    for obj in self.cells.get((cellRow, cellCol), ()):
+                        if obj in candidates:
+                            found.append((obj, cellRow, cellCol))
+            return found
+
+        return [(obj, position[0], position[1]) for obj, position in candidates.items()
+                if position[0] in rows and position[1] in cols]
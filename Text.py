@@ -0,0 +1,82 @@
+from collections import OrderedDict
+import pygame
+
+
+# Rendered text surfaces keyed by (font, text, antialias, color).
+# Fonts are keyed by identity so keep reusing the same Font object, least recently used surfaces go past max_size.
+class TextCache:
+
+    def __init__(self, max_size=512):
+        self.maxSize = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, tuple(color))
+
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxSize:
+            self.surfaces.popitem(last=False)
+
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+# One Font object per (file, size) plus the remembered answers of fit
+class FontCache:
+
+    def __init__(self):
+        self.fonts = {}
+        self.fits = {}
+
+    def get(self, font_file, size):
+        key = (font_file, size)
+
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(font_file, size)
+            self.fonts[key] = font
+
+        return font
+
+    # Largest of the sizes 8, 8 + inc, ... whose text fits inside rect, found by binary search.
+    # Only the width and height of rect matter so results are shared between rects of the same size
+    def fit(self, font_file, rect, text, inc=4):
+        key = (font_file, rect[2], rect[3], text, inc)
+
+        size = self.fits.get(key)
+        if size is None:
+            size = self.fitSize(font_file, rect, text, inc)
+            self.fits[key] = size
+
+        return self.get(font_file, size)
+
+    def fitSize(self, font_file, rect, text, inc):
+        sizes = range(8, 1024, inc)
+
+        # Find the first size that overflows, text only grows with the size
+        low = 0
+        high = len(sizes)
+        while low < high:
+            middle = (low + high) // 2
+            width, height = self.get(font_file, sizes[middle]).size(text)
+            if width > rect[2] or height > rect[3]:
+                high = middle
+            else:
+                low = middle + 1
+
+        # Same fallbacks as the old linear scan: one step below the first overflow, inc when nothing overflows
+        if low == len(sizes):
+            return inc
+        return sizes[low] - inc
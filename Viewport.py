@@ -0,0 +1,139 @@
+import math
+import pygame
+
+from Grid import CONTENTS_CHANGED
+
+
+# Screen position of the camera tile and the range of tile offsets from it that still touch the screen
+def viewWindow(screen_width, screen_height, tile_size):
+    originX = int(screen_width / 2 - int(tile_size / 2))
+    originY = int(screen_height / 2 - int(tile_size / 2))
+
+    firstCol = -math.ceil(originX / tile_size)
+    lastCol = math.ceil((screen_width - originX) / tile_size) - 1
+    firstRow = -math.ceil(originY / tile_size)
+    lastRow = math.ceil((screen_height - originY) / tile_size) - 1
+
+    return originX, originY, firstRow, lastRow, firstCol, lastCol
+
+
+# Works out which tiles cover the screen around the camera tile.
+# camera is [row, col] and sits in the middle of the screen, rows and columns wrap around the map.
+# Returns (row, col, screen x, screen y) for every tile position on screen exactly once.
+def visibleTiles(camera, rows, cols, screen_width, screen_height, tile_size):
+    originX, originY, firstRow, lastRow, firstCol, lastCol = viewWindow(screen_width, screen_height, tile_size)
+
+    visible = []
+    for dy in range(firstRow, lastRow + 1):
+        row = (camera[0] + dy) % rows
+        y = originY + dy * tile_size
+        for dx in range(firstCol, lastCol + 1):
+            visible.append((row, (camera[1] + dx) % cols, originX + dx * tile_size, y))
+
+    return visible
+
+
+# Screen positions of one tile, more than one when the map is narrower than the screen and wraps into view twice
+def tilePositions(row, col, camera, rows, cols, screen_width, screen_height, tile_size):
+    originX, originY, firstRow, lastRow, firstCol, lastCol = viewWindow(screen_width, screen_height, tile_size)
+
+    positions = []
+    dy = (row - camera[0] - firstRow) % rows + firstRow
+    while dy <= lastRow:
+        dx = (col - camera[1] - firstCol) % cols + firstCol
+        while dx <= lastCol:
+            positions.append((originX + dx * tile_size, originY + dy * tile_size))
+            dx += cols
+        dy += rows
+
+    return positions
+
+
+# Keeps the map pre-rendered in square chunks of tiles.
+# paint(surface, row, col, x, y) draws a single tile into a chunk, chunks are redrawn only after one of their
+# tiles changes terrain or flags. Contents are not baked in and get drawn on top every frame.
+# Only chunks near the screen are rendered, off-screen surfaces are dropped once there are more than max_surfaces.
+class ChunkCache:
+
+    def __init__(self, grid, tile_size, paint, chunk_size=8, max_surfaces=64):
+        self.grid = grid
+        self.tileSize = tile_size
+        self.paint = paint
+        self.chunkSize = chunk_size
+        self.chunkRows = math.ceil(grid.rows / chunk_size)
+        self.chunkCols = math.ceil(grid.cols / chunk_size)
+        self.maxSurfaces = max_surfaces
+
+        self.surfaces = {}
+        self.dirty = set()
+        self.renders = 0
+
+        grid.listeners.append(self.onTileChanged)
+
+    def onTileChanged(self, row, col, change):
+        chunk = (row // self.chunkSize, col // self.chunkSize)
+        if change != CONTENTS_CHANGED and chunk in self.surfaces:
+            self.dirty.add(chunk)
+
+    def render(self, chunk, target):
+        rowStart = chunk[0] * self.chunkSize
+        colStart = chunk[1] * self.chunkSize
+        rowEnd = min(rowStart + self.chunkSize, self.grid.rows)
+        colEnd = min(colStart + self.chunkSize, self.grid.cols)
+
+        surface = self.surfaces.get(chunk)
+        if surface is None:
+            size = ((colEnd - colStart) * self.tileSize, (rowEnd - rowStart) * self.tileSize)
+            surface = pygame.Surface(size, 0, target)
+            self.surfaces[chunk] = surface
+
+        for row in range(rowStart, rowEnd):
+            for col in range(colStart, colEnd):
+                self.paint(surface, row, col, (col - colStart) * self.tileSize, (row - rowStart) * self.tileSize)
+
+        self.dirty.discard(chunk)
+        self.renders += 1
+        return surface
+
+    # Blits every chunk that overlaps the target with the camera tile in the middle, repeating across the wrap
+    def draw(self, target, camera):
+        width, height = target.get_size()
+        originX, originY, firstRow, lastRow, firstCol, lastCol = viewWindow(width, height, self.tileSize)
+        periodX = self.grid.cols * self.tileSize
+        periodY = self.grid.rows * self.tileSize
+
+        chunkRows = {(camera[0] + dy) % self.grid.rows // self.chunkSize for dy in range(firstRow, lastRow + 1)}
+        chunkCols = {(camera[1] + dx) % self.grid.cols // self.chunkSize for dx in range(firstCol, lastCol + 1)}
+
+        blits = []
+        visible = set()
+        for chunkRow in chunkRows:
+            for chunkCol in chunkCols:
+                chunk = (chunkRow, chunkCol)
+                visible.add(chunk)
+
+                surface = self.surfaces.get(chunk)
+                if surface is None or chunk in self.dirty:
+                    surface = self.render(chunk, target)
+                chunkWidth, chunkHeight = surface.get_size()
+
+                startX = originX + (chunkCol * self.chunkSize - camera[1]) * self.tileSize
+                startX = (startX + chunkWidth) % periodX - chunkWidth
+                startY = originY + (chunkRow * self.chunkSize - camera[0]) * self.tileSize
+                startY = (startY + chunkHeight) % periodY - chunkHeight
+
+                y = startY
+                while y < height:
+                    x = startX
+                    while x < width:
+                        blits.append((surface, (x, y)))
+                        x += periodX
+                    y += periodY
+
+        target.blits(blits, False)
+
+        if len(self.surfaces) > self.maxSurfaces:
+            for chunk in list(self.surfaces.keys()):
+                if chunk not in visible:
+                    del self.surfaces[chunk]
+                    self.dirty.discard(chunk)
@@ -0,0 +1,140 @@
+import numpy as np
+
+
+# Multipliers turning (dx, dy) in the first octant into each of the eight octants around the viewer
+OCTANTS = ((1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+           (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1))
+
+
+# Tiles seen from (x, y) out to radius with recursive shadowcasting, the map wraps at its edges.
+# blocked(x, y) says whether a tile stops sight, blocking tiles are seen themselves but hide what lies behind them.
+# The viewer's own tile is always visible and never blocks.
+def fieldOfView(blocked, x, y, radius, rows, cols):
+    x %= rows
+    y %= cols
+    visible = {(x, y)}
+    for xx, xy, yx, yy in OCTANTS:
+        castLight(blocked, x, y, radius, 1, 1.0, 0.0, (xx, xy, yx, yy), visible, rows, cols)
+    return visible
+
+
+# Scans one octant row by row between the start and end slopes, recursing past every run of blocking tiles
+def castLight(blocked, x, y, radius, row, start, end, octant, visible, rows, cols):
+    if start < end:
+        return
+
+    xx, xy, yx, yy = octant
+    radiusSquared = radius * radius
+
+    for distance in range(row, radius + 1):
+        dx = -distance - 1
+        dy = -distance
+        inShadow = False
+        nextStart = start
+
+        while dx <= 0:
+            dx += 1
+            leftSlope = (dx - 0.5) / (dy + 0.5)
+            rightSlope = (dx + 0.5) / (dy - 0.5)
+            if start < rightSlope:
+                continue
+            if end > leftSlope:
+                break
+
+            tile = ((x + dx * xx + dy * xy) % rows, (y + dx * yx + dy * yy) % cols)
+            if dx * dx + dy * dy <= radiusSquared:
+                visible.add(tile)
+
+            if inShadow:
+                if blocked(tile[0], tile[1]):
+                    nextStart = rightSlope
+                else:
+                    inShadow = False
+                    start = nextStart
+            elif blocked(tile[0], tile[1]) and distance < radius:
+                inShadow = True
+                castLight(blocked, x, y, radius, distance + 1, start, leftSlope, octant, visible, rows, cols)
+                nextStart = rightSlope
+
+        if inShadow:
+            break
+
+
+# Whether each observer can see its target, for any number of (observer, target) pairs at once.
+# Sight follows the straight line between the two tiles going the short way around the map, a tile on the line
+# (the two ends excluded) blocks when flags[row, col] & blocker is set. flags is indexed with arrays of rows and
+# columns so both a Grid's flags array and a ChunkedWorld's layer work. Returns a boolean array, one per pair.
+def lineOfSightMany(flags, blocker, pairs):
+    rows, cols = flags.shape
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 4)
+    if len(pairs) == 0:
+        return np.zeros(0, dtype=bool)
+
+    startRow = pairs[:, 0] % rows
+    startCol = pairs[:, 1] % cols
+    dRow = (pairs[:, 2] - startRow + rows // 2) % rows - rows // 2
+    dCol = (pairs[:, 3] - startCol + cols // 2) % cols - cols // 2
+
+    # One point per step along the longer axis, only the ones strictly between the ends are checked
+    steps = np.maximum(np.abs(dRow), np.abs(dCol))
+    longest = int(steps.max())
+    if longest < 2:
+        return np.ones(len(pairs), dtype=bool)
+
+    # d * k / steps rounded half up in integers, (2 * d * k + steps) // (2 * steps), so float error can not flip a tile
+    step = np.arange(1, longest)[None, :]
+    between = step < steps[:, None]
+    length = np.maximum(steps, 1)[:, None]
+    lineRows = (startRow[:, None] + (2 * dRow[:, None] * step + length) // (2 * length)) % rows
+    lineCols = (startCol[:, None] + (2 * dCol[:, None] * step + length) // (2 * length)) % cols
+
+    blocking = (np.asarray(flags[lineRows[between], lineCols[between]]) & blocker) != 0
+    hidden = np.zeros(between.shape, dtype=bool)
+    hidden[between] = blocking
+    return ~hidden.any(axis=1)
+
+
+# Remembers fieldOfView results keyed by (x, y, radius, blocker version).
+# Every visible tile points back at the views it appears in, tiles that were not visible can not change what is
+# seen so a blocker showing up or going away only drops the views it was seen in.
+class FieldOfViewCache:
+
+    def __init__(self):
+        self.version = 0
+        self.entries = {}
+        self.byTile = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, blocked, x, y, radius, rows, cols):
+        key = (x % rows, y % cols, radius, self.version)
+
+        result = self.entries.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        self.misses += 1
+        result = frozenset(fieldOfView(blocked, x, y, radius, rows, cols))
+        self.entries[key] = result
+        for tile in result:
+            self.byTile.setdefault(tile, set()).add(key)
+
+        return result
+
+    # Drops every view the tile at (x, y) is visible in
+    def invalidate(self, x, y):
+        keys = self.byTile.pop((x, y), None)
+        if keys is None:
+            return
+
+        for key in keys:
+            for tile in self.entries.pop(key):
+                if tile != (x, y):
+                    self.byTile[tile].discard(key)
+
+    # Called when the whole map is rebuilt, old entries can never match again
+    def reset(self):
+        self.version += 1
+        self.entries = {}
+        self.byTile = {}
@@ -0,0 +1,182 @@
+import numpy as np
+
+from Grid import Grid
+
+
+# One square piece of a ChunkedWorld, the same layers a Grid keeps for the whole map
+class Chunk:
+
+    def __init__(self, terrain, difficulty):
+        self.terrain = terrain
+        self.difficulty = difficulty
+        self.flags = np.zeros(terrain.shape, dtype=np.uint8)
+        self.edited = False
+
+
+# Stands in for one of Grid's [row, col] arrays, reading and writing through the world's chunks.
+# Single tiles are indexed like an array, arrays of rows and columns (np.ix_ for example) gather a copy.
+# Indices wrap around the world.
+class ChunkedLayer:
+
+    def __init__(self, world, name, dtype):
+        self.world = world
+        self.name = name
+        self.dtype = dtype
+        self.shape = (world.rows, world.cols)
+
+    def __getitem__(self, key):
+        row, col = key
+        if isinstance(row, (int, np.integer)) and isinstance(col, (int, np.integer)):
+            size = self.world.chunkSize
+            row %= self.shape[0]
+            col %= self.shape[1]
+            return getattr(self.world.chunk(row // size, col // size), self.name)[row % size, col % size]
+        return self.gather(row, col)
+
+    def __setitem__(self, key, value):
+        row, col = key
+        size = self.world.chunkSize
+        row %= self.shape[0]
+        col %= self.shape[1]
+        getattr(self.world.chunk(row // size, col // size), self.name)[row % size, col % size] = value
+
+    def gather(self, rows, cols):
+        size = self.world.chunkSize
+        rows, cols = np.broadcast_arrays(np.asarray(rows) % self.shape[0], np.asarray(cols) % self.shape[1])
+        out = np.empty(rows.shape, dtype=self.dtype)
+
+        chunkIds = (rows // size) * self.world.chunkCols + cols // size
+        for chunkId in np.unique(chunkIds):
+            inChunk = chunkIds == chunkId
+            layer = getattr(self.world.chunk(*divmod(int(chunkId), self.world.chunkCols)), self.name)
+            out[inChunk] = layer[rows[inChunk] % size, cols[inChunk] % size]
+
+        return out
+
+    # height by width block starting at rowStart, colStart, wrapping around the world
+    def window(self, rowStart, colStart, height, width):
+        return self.gather(np.arange(rowStart, rowStart + height)[:, None],
+                           np.arange(colStart, colStart + width)[None, :])
+
+
+# A Grid too big to keep in memory, generated chunk by chunk from a seed as it is first touched.
+# generator(rowStart, colStart, shape, rng) returns the terrain ids of one chunk, rng is seeded from the world seed
+# and the chunk so a chunk comes out the same every time it is generated. The last row and column of chunks are
+# cut short when the world size is not a multiple of chunk_size.
+# stream() loads the chunks around a position and drops far away ones, a dropped chunk is generated again when
+# needed. Chunks with flags set (blockers, highlights) are kept and edited terrain is remembered on its own.
+class ChunkedWorld(Grid):
+
+    def __init__(self, rows, cols, terrains, tile_type, generator, seed=0, chunk_size=32, load_radius=1,
+                 keep_radius=3):
+        if seed < 0:
+            raise ValueError("World seed %d is negative" % seed)
+
+        self.generator = generator
+        self.seed = seed
+        self.chunkSize = chunk_size
+        self.chunkRows = -(-rows // chunk_size)
+        self.chunkCols = -(-cols // chunk_size)
+        self.loadRadius = load_radius
+        self.keepRadius = keep_radius
+
+        self.chunks = {}
+        self.edits = {}
+        self.generated = 0
+        self.evicted = 0
+
+        super().__init__(rows, cols, terrains, tile_type)
+
+    # Layers read and write through the chunks, nothing the size of the whole world is allocated
+    def createLayers(self, terrain):
+        self.terrain = ChunkedLayer(self, "terrain", np.uint8)
+        self.difficulty = ChunkedLayer(self, "difficulty", np.float32)
+        self.flags = ChunkedLayer(self, "flags", np.uint8)
+
+    def chunk(self, chunk_row, chunk_col):
+        key = (chunk_row % self.chunkRows, chunk_col % self.chunkCols)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.load(key)
+        return chunk
+
+    def load(self, key):
+        terrain = self.edits.pop(key, None)
+        edited = terrain is not None
+        if terrain is None:
+            terrain = self.generate(key)
+
+        chunk = Chunk(terrain, self.terrainCosts[terrain])
+        chunk.edited = edited
+        self.chunks[key] = chunk
+        return chunk
+
+    def chunkShape(self, key):
+        rowStart = key[0] * self.chunkSize
+        colStart = key[1] * self.chunkSize
+        return min(self.chunkSize, self.rows - rowStart), min(self.chunkSize, self.cols - colStart)
+
+    def generate(self, key):
+        rng = np.random.default_rng((self.seed, key[0], key[1]))
+        terrain = self.generator(key[0] * self.chunkSize, key[1] * self.chunkSize, self.chunkShape(key), rng)
+        self.generated += 1
+        return np.asarray(terrain, dtype=np.uint8)
+
+    # Terrain ids of a chunk as they are now, without keeping the chunk loaded if it was not already
+    def chunkTerrain(self, key):
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            return chunk.terrain
+        if key in self.edits:
+            return self.edits[key]
+        return self.generate(key)
+
+    # Keys of every chunk whose terrain was changed after it was generated, loaded or not
+    def editedChunks(self):
+        return [key for key, chunk in self.chunks.items() if chunk.edited] + list(self.edits.keys())
+
+    # Chunks between two chunk keys along the longer axis, going whichever way around the world is shorter
+    def chunkDistance(self, key, other):
+        dRow = abs(key[0] - other[0])
+        dCol = abs(key[1] - other[1])
+        return max(min(dRow, self.chunkRows - dRow), min(dCol, self.chunkCols - dCol))
+
+    # Makes sure the chunks around row, col are loaded and drops the ones further than keep_radius chunks away
+    def stream(self, row, col):
+        center = ((row // self.chunkSize) % self.chunkRows, (col // self.chunkSize) % self.chunkCols)
+        for dRow in range(-self.loadRadius, self.loadRadius + 1):
+            for dCol in range(-self.loadRadius, self.loadRadius + 1):
+                self.chunk(center[0] + dRow, center[1] + dCol)
+
+        for key in list(self.chunks.keys()):
+            if self.chunkDistance(key, center) > self.keepRadius:
+                self.evict(key)
+
+    def evict(self, key):
+        chunk = self.chunks[key]
+        if chunk.flags.any():
+            return False
+
+        if chunk.edited:
+            self.edits[key] = chunk.terrain
+        del self.chunks[key]
+        self.evicted += 1
+        return True
+
+    def setTerrain(self, row, col, terrain):
+        self.chunk(row // self.chunkSize, col // self.chunkSize).edited = True
+        super().setTerrain(row, col, terrain)
+
+    def fill(self, terrain, rows=slice(None), cols=slice(None)):
+        raise TypeError("A ChunkedWorld is painted by its generator, use setTerrain for single tiles")
+
+    # Only loaded chunks can have flags set since flagged chunks are never dropped
+    def withFlag(self, flag):
+        found = [np.argwhere(chunk.flags & flag) + (key[0] * self.chunkSize, key[1] * self.chunkSize)
+                 for key, chunk in self.chunks.items()]
+        if len(found) == 0:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.concatenate(found)
+
+    def blockers(self):
+        raise TypeError("A ChunkedWorld has no whole-map blocker mask, use blockersIn for a region")
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import the game modules from the repository root and never open a window
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from Dice import compileDice
+
+
+@pytest.mark.parametrize("text, dice, constant", [
+    ("d6", ((1, 6),), 0),
+    ("1d6", ((1, 6),), 0),
+    ("2d6-1d4", ((2, 6), (1, 4)), 0),
+    ("3d8-2", ((3, 8),), 2),
+    ("4", (), 4),
+    ("1d4-1d4-1d4", ((1, 4), (1, 4), (1, 4)), 0),
+    (" 2d10 - 3 ", ((2, 10),), 3),
+])
+def test_grammar(text, dice, constant):
+    roller = compileDice(text)
+    assert roller.dice == dice
+    assert roller.constant == constant
+
+
+@pytest.mark.parametrize("text", ["", "2d", "d", "2d6-", "2x6", "1d0", "-1d6", "2d6+1"])
+def test_unreadable_dice(text):
+    with pytest.raises(ValueError):
+        compileDice(text)
+
+
+def test_compiled_once():
+    assert compileDice("2d6-1d4") is compileDice("2d6-1d4")
+
+
+@pytest.mark.parametrize("text, low, high", [("d6", 1, 6), ("2d6-1d4-3", 6, 19), ("5", 5, 5)])
+def test_roll_bounds(text, low, high):
+    roller = compileDice(text)
+    rng = np.random.default_rng(3)
+    rolls = [roller.roll(rng) for count in range(500)]
+    assert min(rolls) == low
+    assert max(rolls) == high
+
+
+@pytest.mark.parametrize("text, low, high", [("d6", 1, 6), ("2d6-1d4-3", 6, 19), ("5", 5, 5)])
+def test_roll_many_bounds(text, low, high):
+    totals = compileDice(text).rollMany(5000, np.random.default_rng(3))
+    assert totals.shape == (5000,)
+    assert totals.dtype == np.int64
+    assert totals.min() == low
+    assert totals.max() == high
+
+
+def test_same_seed_same_rolls():
+    roller = compileDice("3d8-1d4-2")
+    assert roller.roll(np.random.default_rng(9)) == roller.roll(np.random.default_rng(9))
+    assert (roller.rollMany(50, np.random.default_rng(9)) == roller.rollMany(50, np.random.default_rng(9))).all()
@@ -0,0 +1,52 @@
+import pytest
+
+from Effects import BLUNT, PSYCHIC, DamageEffect, HealEffect, SpellEffect, parseAction
+
+
+def test_no_action():
+    assert parseAction("") is None
+
+
+def test_heal():
+    effect = parseAction("H-1d10-False")
+    assert isinstance(effect, HealEffect)
+    assert effect.dice.dice == ((1, 10),)
+    assert effect.temporary is False
+
+
+def test_heal_with_several_dice():
+    effect = parseAction("H-2d6-1d4-False")
+    assert isinstance(effect, HealEffect)
+    assert effect.dice.dice == ((2, 6), (1, 4))
+    assert effect.temporary is False
+
+
+def test_damage():
+    effect = parseAction("D-2d6-psychic-True")
+    assert isinstance(effect, DamageEffect)
+    assert effect.dice.dice == ((2, 6),)
+    assert effect.damageType == PSYCHIC
+    assert effect.lethal is True
+
+
+def test_damage_with_a_flat_bonus():
+    effect = parseAction("D-1d8-1-blunt-False")
+    assert isinstance(effect, DamageEffect)
+    assert effect.dice.dice == ((1, 8),)
+    assert effect.dice.constant == 1
+    assert effect.damageType == BLUNT
+    assert effect.lethal is False
+
+
+def test_spell():
+    effect = parseAction("S-WaterWall-1")
+    assert isinstance(effect, SpellEffect)
+    assert effect.name == "WaterWall"
+    assert effect.level == 1
+
+
+@pytest.mark.parametrize("action", ["X-1d6-False", "H", "H-False", "H--False", "D-1d6-cold-False", "D-1d6-False",
+                                    "S-WaterWall-one"])
+def test_unreadable_actions(action):
+    with pytest.raises(ValueError):
+        parseAction(action)
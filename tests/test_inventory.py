@@ -0,0 +1,133 @@
+import pytest
+
+import Game
+from Inventory import Inventory
+
+
+@pytest.fixture(scope="module", autouse=True)
+def game():
+    Game.init(headless=True)
+    yield
+    Game.ASSET_MANAGER.shutdown()
+
+
+def makeItems(count, name="Ring", weight=1, value=5):
+    return [Game.Item(name, weight, value, name=name) for index in range(count)]
+
+
+def test_identical_items_share_a_stack():
+    inventory = Inventory()
+    rings = makeItems(3)
+    for item in rings + makeItems(1, "Rope", 2, 1):
+        inventory.add(item)
+
+    assert len(inventory) == 4
+    assert inventory.stackCount() == 2
+    assert inventory.stack(rings[0]) is inventory.stack(rings[2])
+    assert inventory.stack(rings[0]).quantity == 3
+    assert inventory.get(rings[1].OID) is rings[1]
+
+    with pytest.raises(ValueError):
+        inventory.add(rings[0])
+
+
+def test_equip_and_unequip_within_a_stack():
+    inventory = Inventory()
+    rings = makeItems(3)
+    for item in rings:
+        inventory.add(item)
+    stack = inventory.stack(rings[0])
+
+    inventory.equip(rings[1])
+    assert inventory.isEquipped(rings[1])
+    assert stack.equipped == 1
+    assert stack.quantity == 3
+    assert stack.pick(equipped=True) is rings[1]
+    assert stack.pick() in (rings[0], rings[2])
+
+    inventory.unequip(rings[1])
+    assert not inventory.isEquipped(rings[1])
+    assert stack.equipped == 0
+    assert stack.pick(equipped=True) is None
+
+
+def test_removing_the_last_item_drops_the_stack():
+    inventory = Inventory()
+    rings = makeItems(2)
+    rope = makeItems(1, "Rope", 2, 1)[0]
+    for item in rings + [rope]:
+        inventory.add(item)
+    assert [stack.name for stack in inventory.sortedBy("name")] == ["Ring", "Rope"]
+
+    inventory.equip(rings[0])
+    inventory.remove(rings[0])
+    assert rings[0] not in inventory
+    assert list(inventory.equippedItems()) == []
+    assert inventory.stack(rings[1]).quantity == 1
+
+    inventory.remove(rings[1])
+    assert inventory.stackCount() == 1
+    assert [stack.name for stack in inventory.sortedBy("name")] == ["Rope"]
+
+    with pytest.raises(ValueError):
+        inventory.remove(rings[1])
+
+
+def test_drop_takes_an_equipped_item_off():
+    Game.newGame()
+    character = Game.MainCharacter
+    glasses = list(character.items)
+    character.equip(glasses[0])
+
+    character.drop(glasses[0])
+
+    assert glasses[0] not in character.items
+    assert not character.items.isEquipped(glasses[0])
+    assert not glasses[0].equipped
+    assert len(character.items) == len(glasses) - 1
+    assert Game.tiles.locate(glasses[0]) == (character.x, character.y)
+
+
+@pytest.fixture
+def shop():
+    inventory = Inventory()
+    for name, weight, value in (("Axe", 6, 10), ("Arrow", 0.1, 1), ("Bow", 2, 25), ("Boots", 1, 4),
+                                ("Cloak", 1, 12), ("Bread", 0.5, 1)):
+        for item in makeItems(2, name, weight, value):
+            inventory.add(item)
+    return inventory
+
+
+def names(stacks):
+    return [stack.name for stack in stacks]
+
+
+def test_sorted_pages(shop):
+    assert names(shop.sortedBy("name")) == ["Arrow", "Axe", "Boots", "Bow", "Bread", "Cloak"]
+    assert names(shop.sortedBy("name", 2, 4)) == ["Boots", "Bow"]
+    assert names(shop.sortedBy("value", reverse=True)) == ["Bow", "Cloak", "Axe", "Boots", "Bread", "Arrow"]
+    assert names(shop.sortedBy("value", 0, 2, reverse=True)) == ["Bow", "Cloak"]
+    assert names(shop.sortedBy("value", 4, 10, reverse=True)) == ["Bread", "Arrow"]
+    assert names(shop.sortedBy("value", 8, 10, reverse=True)) == []
+
+    with pytest.raises(ValueError):
+        shop.sortedBy("action")
+
+
+def test_sorted_views_follow_new_and_emptied_stacks(shop):
+    shop.sortedBy("weight")
+    dagger = makeItems(1, "Dagger", 1.5, 8)[0]
+    shop.add(dagger)
+    assert names(shop.within("weight", 1, 2)) == ["Boots", "Cloak", "Dagger", "Bow"]
+
+    shop.remove(dagger)
+    assert names(shop.within("weight", 1, 2)) == ["Boots", "Cloak", "Bow"]
+
+
+def test_within_and_named(shop):
+    assert names(shop.within("value", 4, 12)) == ["Boots", "Axe", "Cloak"]
+    assert names(shop.within("value", high=1)) == ["Arrow", "Bread"]
+    assert names(shop.within("weight", low=2)) == ["Bow", "Axe"]
+    assert names(shop.named("B")) == ["Boots", "Bow", "Bread"]
+    assert names(shop.named("Bo")) == ["Boots", "Bow"]
+    assert names(shop.named("Z")) == []
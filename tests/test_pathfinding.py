@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+import pytest
+
+from Pathfinding import findReachable
+
+BASE_MOVEMENT_COST = 5
+
+
+class Square:
+
+    def __init__(self, difficulty):
+        self.difficulty = difficulty
+
+
+def makeTiles(rows, cols, seed):
+    rng = random.Random(seed)
+    return [[Square(rng.choice((1, 0.75))) for col in range(cols)] for row in range(rows)]
+
+
+# Character.isPossible as it was before findReachable replaced it, kept as the reference
+def isPossible(tiles, x, y, speed, possibilities):
+    if x == len(tiles):
+        x = 0
+
+    if y == len(tiles[0]):
+        y = 0
+
+    using = tiles[x][y].difficulty * BASE_MOVEMENT_COST
+
+    if using > speed:
+        return None
+
+    possibilities.append((x, y, speed - using))
+
+    for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+        if not inPossibilityList(possibilities, (nx, ny, speed - using)):
+            found = isPossible(tiles, nx, ny, speed - using, possibilities)
+            if found is not None:
+                possibilities = list(set(found).union(set(possibilities)))
+
+    return possibilities
+
+
+def inPossibilityList(possibilities, pos):
+    for p in possibilities:
+        if p[2] < pos[2]:
+            continue
+        elif p[0] == pos[0] and p[1] == pos[1]:
+            return True
+
+
+def difficultyOf(tiles):
+    return np.array([[square.difficulty for square in row] for row in tiles], dtype=np.float32)
+
+
+def reachedTiles(reachable, rows, cols):
+    return {(x % rows, y % cols) for x, y, remaining in reachable}
+
+
+# The old recursion only wrapped past the far edge and relied on negative indexing for the near one,
+# so the maps are wider than any range to stay inside what it handled
+@pytest.mark.parametrize("rows, cols", [(8, 8), (9, 11), (16, 24)])
+@pytest.mark.parametrize("movement", [5, 12, 20, 35])
+def test_same_tiles_as_the_old_recursion(rows, cols, movement):
+    for seed in range(3):
+        tiles = makeTiles(rows, cols, seed)
+        x, y = rows // 2, cols // 3
+        expected = isPossible(tiles, x, y, movement, []) or []
+        assert reachedTiles(findReachable(difficultyOf(tiles), x, y, movement, BASE_MOVEMENT_COST), rows, cols) == \
+            reachedTiles(expected, rows, cols)
+
+
+def test_each_tile_once_with_its_best_remaining_movement():
+    tiles = makeTiles(8, 8, 1)
+    reachable = findReachable(difficultyOf(tiles), 3, 4, 35, BASE_MOVEMENT_COST)
+    assert len(reachable) == len({(x, y) for x, y, remaining in reachable})
+
+    best = {}
+    for x, y, remaining in isPossible(tiles, 3, 4, 35, []):
+        key = (x % 8, y % 8)
+        best[key] = max(best.get(key, remaining), remaining)
+    assert {(x, y): remaining for x, y, remaining in reachable} == best
+
+
+def test_start_tile_too_expensive():
+    assert findReachable(difficultyOf(makeTiles(4, 4, 0)), 1, 1, 3, BASE_MOVEMENT_COST) == []
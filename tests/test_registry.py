@@ -0,0 +1,30 @@
+import pytest
+
+from Registry import INDEX_BITS, INDEX_MASK, Registry
+
+
+def test_released_slot_is_reused_with_a_new_generation():
+    registry = Registry()
+    first = object()
+    second = object()
+
+    oid = registry.add(first)
+    registry.remove(oid)
+    reused = registry.add(second)
+
+    assert reused & INDEX_MASK == oid & INDEX_MASK
+    assert reused >> INDEX_BITS == (oid >> INDEX_BITS) + 1
+    assert registry.get(oid) is None
+    assert oid not in registry
+    assert registry.get(reused) is second
+    assert len(registry) == 1
+
+
+def test_stale_oid_can_not_be_removed():
+    registry = Registry()
+    oid = registry.add(object())
+    registry.remove(oid)
+    registry.add(object())
+
+    with pytest.raises(KeyError):
+        registry.remove(oid)
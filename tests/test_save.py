@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+import pytest
+
+import Game
+import Save
+
+
+@pytest.fixture(scope="module", autouse=True)
+def game():
+    Game.init(headless=True)
+    yield
+    Game.ASSET_MANAGER.shutdown()
+
+
+@pytest.fixture
+def saveFile(tmp_path):
+    Game.newGame()
+    yield str(tmp_path / "test.qsav")
+    Game.forgetSave()
+
+
+def snapshot():
+    terrain = Game.tiles.terrain[np.ix_(range(Game.tiles.rows), range(Game.tiles.cols))]
+    contents = sorted((type(obj).__name__, row, col) for obj, (row, col) in Game.tiles.index.positions.items())
+    items = sorted((item.type, Game.MainCharacter.items.isEquipped(item)) for item in Game.MainCharacter.items)
+    return terrain, contents, items, list(Game.camera)
+
+
+def assertSameGame(before, after):
+    assert (before[0] == after[0]).all()
+    assert before[1:] == after[1:]
+
+
+def test_round_trip(saveFile):
+    Game.tiles.setTerrain(2, 3, Game.DirtRoad)
+    Game.MainCharacter.equip(next(iter(Game.MainCharacter.items)))
+    before = snapshot()
+    objects = len(Game.OIDS)
+
+    Game.saveGame(saveFile)
+    Game.loadGame(saveFile)
+
+    assertSameGame(before, snapshot())
+    # The loaded objects take the place of the old ones in the registry
+    assert len(Game.OIDS) == objects
+
+
+def test_round_trip_with_appends(saveFile):
+    Game.saveGame(saveFile)
+    for col in range(5):
+        Game.tiles.setTerrain(1, col, Game.DirtRoad)
+        Game.saveGame(saveFile, incremental=True)
+    before = snapshot()
+
+    Game.loadGame(saveFile)
+
+    assertSameGame(before, snapshot())
+
+
+def test_appends_trigger_compaction(saveFile):
+    Game.saveGame(saveFile)
+    compact = os.path.getsize(saveFile)
+    assert Save.SaveFile(saveFile).liveSize == compact
+
+    sizes = []
+    for count in range(20):
+        Game.saveGame(saveFile, incremental=True)
+        sizes.append(os.path.getsize(saveFile))
+
+    # The file grows while appending and drops back to a compact one once half of it is left behind
+    assert max(sizes) <= (2 + Save.COMPACT_RATIO) * compact
+    assert compact in sizes[1:]
+    assert Game.SAVED.size - Game.SAVED.liveSize <= Save.COMPACT_RATIO * Game.SAVED.liveSize
+
+
+def test_new_map_forgets_the_save(saveFile):
+    Game.saveGame(saveFile)
+    assert Game.SAVED is not None
+
+    Game.generateTiles()
+    assert Game.SAVED is None
+
+    Game.saveGame(saveFile, incremental=True)
+    Game.generateWorld(3)
+    assert Game.SAVED is None